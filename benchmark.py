@@ -0,0 +1,273 @@
+# Import modules
+import os
+# (benchmark without a real window, and keep pygame quiet)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import pygame
+
+# Import classes
+from classes.game import Game
+from classes.block import Block
+from classes.segment import Segment
+
+# Number of corners in each snake scenario (0 is the level's starting snake)
+SNAKES = {
+    "short": 0,
+    "long": 120
+}
+# Number of cells left free on near-full boards
+NEAR_FULL_FREE = 40
+# Default number of calls timed in each repeat, by benchmark
+# (player updates are kept short, so the snake never reaches a wall)
+NUMBER = {
+    "player_update": 20,
+    "create_mouse": 20,
+    "level_draw": 50,
+    "panel_draw": 200,
+    "render_text": 200,
+    "display_frame": 50
+}
+
+def grow_snake (level, corners):
+    """ Replaces the tail of the level's snake with a staircase of segments,
+    behind the head (down and right of it), so the snake has many corners.
+    level --    (object -- Level) The loaded level
+    corners --  (int) The number of corners to add
+    returns --  (None)
+    """
+    player = level.player
+    head = player.segment_list[0]
+    t = player.thickness
+    # the staircase fits between the head and the bottom right walls
+    steps = corners // 2 + 1
+    w = max(1, int((level.b_size[0] - 20 - head.rect.right) / steps))
+    h = max(1, int((level.b_size[1] - 20 - head.rect.bottom) / steps))
+    # start at the corner at the end of the head
+    x = head.rect.right - t
+    y = head.rect.top
+    for i in range(corners):
+        # the snake moved up to the corner, and left before that
+        if i % 2 == 0:
+            seg = Segment(player.game.GREEN, [x, y], t, "up")
+            seg.add_length(h + t - 1)
+            y += h
+        else:
+            seg = Segment(player.game.GREEN, [x, y], t, "left")
+            seg.add_length(w + t - 1)
+            x += w
+        # add to the end of the snake, the same as Player.create_segment
+        player.segment_list.append(seg)
+        player.segments.add(seg)
+        level.add_sprite(seg)
+        if len(player.segment_list) > 3:
+            level.add_collideable(seg)
+
+def fill_board (level, free):
+    """ Covers all but a few of the free cells on the level's board.
+    level --    (object -- Level) The loaded level
+    free --     (int) The number of cells to leave free
+    returns --  (None)
+    """
+    # pick the cells to leave free from our own stream
+    rng = level.game.get_random("benchmark")
+    cells = list(level.occupancy.free)
+    rng.shuffle(cells)
+    size = level.occupancy.cell_size
+    for cell in cells[free:]:
+        level.add_sprite(
+            Block(level.color, [cell[0] * size, cell[1] * size], [size, size])
+        )
+
+def load_level (game, index, snake="short", board="normal"):
+    """ Loads a level, ready to be played, in the given scenario.
+    game --     (object -- Game) The loaded game
+    index --    (int) The index of the level to load
+    snake --    (str) The snake scenario, see SNAKES
+    board --    (str) "normal", or "near_full"
+    returns --  (object -- Level) The loaded level
+    """
+    # stop anything left over from the last scenario
+    # (and start from the same random numbers each time)
+    game.transitions.queue.clear()
+    game.game_over = False
+    game.paused = False
+    game.score = 0
+    game.lives = 0
+    game.random = {}
+    game.ticks = 0
+    game.current_level = index
+    level = game.get_level()
+    level.load()
+    if SNAKES[snake]:
+        grow_snake(level, SNAKES[snake])
+    if board == "near_full":
+        fill_board(level, NEAR_FULL_FREE)
+    # everything is drawn on the next full frame
+    game.panel.invalidate()
+    return level
+
+def time_calls (setup, number, repeat):
+    """ Times a call, set up again before each repeat.
+    setup --    (function) Sets up a scenario, returns the call to time
+    number --   (int) The number of calls timed in each repeat
+    repeat --   (int) The number of repeats
+    returns --  (dict) Microseconds per call: min, median, mean, max
+    """
+    times = []
+    for i in range(repeat):
+        call = setup()
+        start = time.perf_counter()
+        for j in range(number):
+            call()
+        times.append((time.perf_counter() - start) / number * 1e6)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_us": min(times),
+        "median_us": statistics.median(times),
+        "mean_us": statistics.mean(times),
+        "max_us": max(times)
+    }
+
+def get_benchmarks (game):
+    """ Gets every benchmark scenario.
+    game --     (object -- Game) The loaded game
+    returns --  (list) Each benchmark as [name, params, setup]
+    """
+    benchmarks = []
+    levels = range(len(game.level_data))
+    def level_name(i):
+        return game.level_data[i].id
+
+    # Player.update, on each level with short and long snakes
+    for i in levels:
+        for snake in SNAKES:
+            def setup(i=i, snake=snake):
+                return load_level(game, i, snake).player.update
+            benchmarks.append([
+                "player_update", {"level": level_name(i), "snake": snake}, setup
+            ])
+    # Level.create_mouse, on each level with normal and near-full boards
+    for i in levels:
+        for board in ["normal", "near_full"]:
+            def setup(i=i, board=board):
+                return load_level(game, i, board=board).create_mouse
+            benchmarks.append([
+                "create_mouse", {"level": level_name(i), "board": board}, setup
+            ])
+    # Level.draw, on each level with short and long snakes
+    for i in levels:
+        for snake in SNAKES:
+            def setup(i=i, snake=snake):
+                level = load_level(game, i, snake)
+                return lambda: level.draw(game.board)
+            benchmarks.append([
+                "level_draw", {"level": level_name(i), "snake": snake}, setup
+            ])
+    # Panel.draw, when nothing changed and when the score changes every call
+    for change in ["unchanged", "score"]:
+        def setup(change=change):
+            load_level(game, 0)
+            game.panel.draw()
+            if change == "unchanged":
+                return game.panel.draw
+            def call():
+                game.score += 1
+                game.panel.draw()
+            return call
+        benchmarks.append(["panel_draw", {"change": change}, setup])
+    # Messages.render_text, cached and always new text
+    for cache in ["hit", "miss"]:
+        def setup(cache=cache):
+            msgs = game.messages
+            msgs.rendered.clear()
+            if cache == "hit":
+                return lambda: msgs.render_text(
+                    "{STRID|info001score}: 100", game.WHITE
+                )
+            count = iter(range(sys.maxsize))
+            return lambda: msgs.render_text(
+                "{{STRID|info001score}}: {0}".format(next(count)), game.WHITE
+            )
+        benchmarks.append(["render_text", {"cache": cache}, setup])
+    # Game.display_frame, on each level with short and long snakes
+    for i in levels:
+        for snake in SNAKES:
+            def setup(i=i, snake=snake):
+                load_level(game, i, snake)
+                return game.display_frame
+            benchmarks.append([
+                "display_frame", {"level": level_name(i), "snake": snake}, setup
+            ])
+    return benchmarks
+
+def main ():
+    # Parse command line options
+    parser = argparse.ArgumentParser(
+        description="Benchmark the hot paths of Snake, results are JSON."
+    )
+    parser.add_argument(
+        "-o", "--output", metavar="FILE",
+        help="file to write the results to (default: standard output)"
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5,
+        help="number of times each benchmark is repeated (default: 5)"
+    )
+    parser.add_argument(
+        "-n", "--number", type=int, default=None,
+        help="number of calls timed in each repeat (default: per benchmark)"
+    )
+    parser.add_argument(
+        "-k", "--filter", default="",
+        help="only run benchmarks whose name contains this"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=1,
+        help="seed for the game's random numbers (default: 1)"
+    )
+    args = parser.parse_args()
+    # paths are relative to where we were run, not to the game
+    output = os.path.abspath(args.output) if args.output else None
+
+    # Initialize PyGame, and load a game to benchmark
+    pygame.init()
+    game = Game("Snake Benchmark")
+    game.load(args.seed)
+
+    results = []
+    for name, params, setup in get_benchmarks(game):
+        if args.filter not in name:
+            continue
+        number = args.number if args.number else NUMBER[name]
+        result = {"benchmark": name, "params": params}
+        result.update(time_calls(setup, number, args.repeat))
+        results.append(result)
+    pygame.quit()
+
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(str(v) for v in pygame.get_sdl_version()),
+        "video_driver": os.environ["SDL_VIDEODRIVER"],
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results
+    }
+    # Write the results
+    if output:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
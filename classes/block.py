@@ -0,0 +1,40 @@
+# pygame module requried
+import pygame
+# define class
+class Block(pygame.sprite.Sprite):
+    """ Base class for the solid colored rectangles that make up a level.
+    The rect (and color) is the only state, the image is built from it
+    when the block is drawn. This lets the game logic run without creating
+    any surfaces (e.g. when running headless).
+    Inherits -- PyGame Sprite class
+    """
+    
+    def __init__(self, color, position, size):
+        """ Constructor
+        color --        (tuple) Group of RGB values
+        position --     (list -- int) x, y coordinates of block's top left corner
+        size  --        (list -- int) width, height dimensions of block
+        """
+        # call parent Sprite constructor
+        super(Block, self).__init__()
+        # set color
+        self.color = color
+        # Create rectangle object for our position and size
+        self.rect = pygame.Rect(0, 0, size[0], size[1])
+        # set position
+        self.rect.x = position[0]
+        self.rect.y = position[1]
+        # the image is created when first needed
+        self._image = None
+    
+    @property
+    def image(self):
+        """ Gets the image of the block, (re)creating it if our size changed.
+        returns --  (object -- pygame.Surface)
+        """
+        # If we haven't created an image of our current size
+        if self._image is None or self._image.get_size() != self.rect.size:
+            # Create block image
+            self._image = pygame.Surface(self.rect.size)
+            self._image.fill(self.color)
+        return self._image
@@ -0,0 +1,111 @@
+# import modules
+import pygame
+# define class
+class Bot(object):
+    """ Plays the game, for unattended runs (e.g. profiling).
+    Each time it acts, it turns towards the nearest mouse,
+    unless that would take it too close to a wall or the snake.
+    The bot plays through Game.move_player, like the player's keys.
+    """
+
+    # Define the unit vector and opposite of each direction
+    VECTORS = {
+        "left": (-1, 0),
+        "right": (1, 0),
+        "up": (0, -1),
+        "down": (0, 1)
+    }
+    OPPOSITES = {
+        "left": "right",
+        "right": "left",
+        "up": "down",
+        "down": "up"
+    }
+    # Define how far (in pixels) ahead the bot looks, and the step it looks in
+    LOOK_AHEAD = 150
+    LOOK_STEP = 5
+    # Define how close (in pixels) the bot will head towards something
+    SAFE_DISTANCE = 40
+
+    def __init__(self, game):
+        """ Constructor
+        game --     (object -- Game) The game to play
+        """
+        self.game = game
+
+    def get_front(self, player):
+        """ Gets the position of the front of the player's head.
+        player --   (object -- Player) The player
+        returns --  (list) The x, y coordinates of the top left of the front
+        """
+        return list(player.get_front().topleft)
+
+    def get_free_distance(self, level, front, direction):
+        """ Gets how far the player can go in a direction before hitting
+        something (up to LOOK_AHEAD).
+        level --        (object -- Level) The current level
+        front --        (list) The front of the player's head, see get_front
+        direction --    (str) The direction to look in
+        returns --      (int) The distance in pixels
+        """
+        t = level.player.thickness
+        dx, dy = self.VECTORS[direction]
+        board = pygame.Rect([0, 0], level.b_size)
+        for dist in range(t, self.LOOK_AHEAD, self.LOOK_STEP):
+            rect = pygame.Rect(front[0] + dx*dist, front[1] + dy*dist, t, t)
+            if not board.contains(rect) or level.get_collisions(rect):
+                return dist
+        return self.LOOK_AHEAD
+
+    def act(self):
+        """ Picks a direction, and turns the player if it isn't the current one.
+        returns --  (None)
+        """
+        game = self.game
+        # Only act while the game is being played
+        if game.game_over or game.paused:
+            return
+        level = game.get_level()
+        player = level.player
+        # Wait for the last turn we made to be made
+        if player.turns:
+            return
+        current = player.direction
+        # We can go on, or turn to either side (but not back on ourselves)
+        options = [
+            d for d in self.VECTORS
+            if d == current or (
+                d != self.OPPOSITES[current] and player.can_turn(d)
+            )
+        ]
+        front = self.get_front(player)
+        head = player.get_front()
+        # find the nearest mouse
+        mouse = None
+        if level.mice:
+            mouse = min(
+                level.mice,
+                key=lambda m: abs(m.rect.x - head.x) + abs(m.rect.y - head.y)
+            )
+        best = None
+        best_score = None
+        for d in options:
+            free = self.get_free_distance(level, front, d)
+            # prefer room to move, and keep away from anything close
+            score = free * 3
+            if free < self.SAFE_DISTANCE:
+                score -= 10000
+            # prefer heading towards the mouse
+            if mouse is not None:
+                dx, dy = self.VECTORS[d]
+                if ((mouse.rect.centerx - head.centerx) * dx +
+                        (mouse.rect.centery - head.centery) * dy) > 0:
+                    score += 100
+            # prefer going on, over turning
+            if d == current:
+                score += 20
+            if best_score is None or score > best_score:
+                best = d
+                best_score = score
+        if best != current:
+            game.move_player(best)
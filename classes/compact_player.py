@@ -0,0 +1,107 @@
+# import classes
+from .player import Player
+from .snake_body import SnakeBody
+# define class
+class CompactPlayer(Player):
+    """ A player snake kept as a SnakeBody (a slotted edge per corner, in a
+    deque), instead of a Segment sprite per corner. Its edges are only in
+    the level's indexes, not in any sprite group, so a very long snake
+    (e.g. in bonus mode) takes less memory, and each tick only touches its
+    head and tail. Its edges have the same geometry as Player's segments,
+    so a game plays the same with either (see verify.py --all-models).
+    Inherits -- Player
+    """
+
+    def _new_body (self, position):
+        """ Creates our body, a single edge, as long as our thickness.
+        position -- (list -- int) x, y coordinates of snake's top left corner
+        returns --  (None)
+        """
+        self.body = SnakeBody(position, self.thickness, self.direction)
+        # add it to the level (the first three edges aren't collideable,
+        # and there is only one)
+        self.game.get_level().add_shape(self.body.edges[0])
+
+    def get_head (self):
+        """ Gets the edge at our head.
+        returns --  (object -- Edge)
+        """
+        return self.body.edges[-1]
+
+    def get_tail (self):
+        """ Gets the edge at our tail.
+        returns --  (object -- Edge)
+        """
+        return self.body.edges[0]
+
+    def _remove_all (self):
+        """ Removes all of the player's edges from the level."""
+        level = self.game.get_level()
+        for edge in self.body.edges:
+            level.remove_shape(edge)
+
+    def create_segment(self, position=False):
+        """ Turns our head in our direction, leaving a corner where it was.
+        position -- (list) Unused, the new edge starts at our head
+        returns --  (none)
+        """
+        level = self.game.get_level()
+        edge = self.body.turn(self.direction)
+        level.add_shape(edge)
+        # If there are more than three edges, make the fourth from our head
+        # collideable (the first three aren't, like Player's segments)
+        if len(self.body.edges) > 3:
+            level.add_shape(self.body.edges[-4], True)
+
+    def can_turn(self, direction):
+        """ Checks if a turn can be made now.
+        direction -- (str) "up", "right", "down", or "left"
+        returns --   (bool)
+        """
+        edges = self.body.edges
+        # If we have turned, and would turn back alongside the edge
+        # before our head, wait until we are far enough from it
+        # (see Player.can_turn)
+        if len(edges) > 1 and edges[-2].direction == self.OPPOSITES[direction]:
+            return edges[-1].length > (self.thickness * 2) + 1
+        return True
+
+    def _move(self, vector, length):
+        """ Moves our head forward, and our tail after it, along our body.
+        vector --   (dict) The x, y we are moving by, see get_vector
+        length --   (float) The distance we are moving
+        returns --  (None)
+        """
+        level = self.game.get_level()
+        # Only the head and tail move, store where they were before this tick
+        head = self.get_head()
+        tail = self.get_tail()
+        self.prev_rects = {
+            head: head.rect.copy(),
+            tail: tail.rect.copy()
+        }
+        removed = self.body.move([vector["x"], vector["y"]], length)
+        level.move_sprite(head)
+        # remove the edges the tail went past (the last of which may have
+        # been collideable)
+        for edge in removed:
+            level.remove_shape(edge)
+        level.move_sprite(self.get_tail())
+
+    def get_draw_rects(self, alpha=1):
+        """ Gets where each of the player's edges should be drawn.
+        The head and tail are drawn part way between where they were before
+        and after the last tick, see Player.get_draw_rects.
+        alpha --    (float) How far (0 - 1) to draw the head and tail from
+                            their previous position to their current position
+        returns --  (list) A [color, pygame.Rect] for each edge
+        """
+        color = self.game.GREEN
+        rects = []
+        for edge in self.body.edges:
+            rect = edge.rect
+            if alpha < 1 and edge in self.prev_rects:
+                prev = self.prev_rects[edge]
+                rect = self.interpolate(prev, rect, alpha)
+            rects.append([color, rect])
+        return rects
@@ -0,0 +1,162 @@
+# import modules
+import json
+import os
+import sys
+import pygame
+# define class
+class FontCache(object):
+    """ Finds the files of system fonts, remembering them on disk.
+    Finding a system font (pygame.font.SysFont) means listing every font
+    installed, which is slow (e.g. running fc-list). The file each font was
+    found in is kept in a cache, by face, bold, and italic, so later runs
+    can open the file directly. The cache is thrown away whenever the
+    font directories change (e.g. a font is installed or removed).
+    """
+
+    # The location of the cache
+    location = "data/cache/fonts.json"
+    # The version of the cache, a cache of another version is thrown away
+    VERSION = 1
+
+    def __init__(self, directory=''):
+        """ Constructor
+        directory --    (str) The directory to prepend to the location
+        """
+        self.filename = directory + self.location
+        # the cached fonts, as {"face|bold|italic": [file, bold, italic]},
+        # read when first needed
+        self.fonts = None
+        self.stamp = None
+
+    def get_directories(self):
+        """ Gets the directories system fonts are installed in.
+        returns --  (list) The directories (that may or may not exist)
+        """
+        home = os.path.expanduser("~")
+        if sys.platform == "win32":
+            windir = os.environ.get("WINDIR", "C:\\Windows")
+            local = os.environ.get("LOCALAPPDATA", home)
+            return [
+                os.path.join(windir, "Fonts"),
+                os.path.join(local, "Microsoft", "Windows", "Fonts")
+            ]
+        if sys.platform == "darwin":
+            return [
+                "/System/Library/Fonts",
+                "/Library/Fonts",
+                os.path.join(home, "Library", "Fonts")
+            ]
+        data_home = os.environ.get(
+            "XDG_DATA_HOME", os.path.join(home, ".local", "share")
+        )
+        return [
+            "/usr/share/fonts",
+            "/usr/local/share/fonts",
+            os.path.join(data_home, "fonts"),
+            os.path.join(home, ".fonts")
+        ]
+
+    def get_stamp(self):
+        """ Gets when each font directory (and each directory in them) was
+        last changed, which changes whenever a font is added or removed.
+        returns --  (dict) The modified time of each directory, by path
+        """
+        stamp = {}
+        for top in self.get_directories():
+            for path, dirs, files in os.walk(top):
+                try:
+                    stamp[path] = os.stat(path).st_mtime_ns
+                except OSError:
+                    pass
+        return stamp
+
+    def read(self):
+        """ Reads the cache, throwing it away if the font directories have
+        changed since it was written.
+        returns --  (None)
+        """
+        self.stamp = self.get_stamp()
+        self.fonts = {}
+        try:
+            with open(self.filename, 'r') as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            # a missing or broken cache is just written again
+            return
+        if cache.get("version") == self.VERSION and cache.get("stamp") == self.stamp:
+            self.fonts = cache.get("fonts", {})
+
+    def write(self):
+        """ Writes the cache.
+        returns --  (None)
+        """
+        temp = self.filename + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            with open(temp, 'w') as file:
+                json.dump({
+                    "version": self.VERSION,
+                    "stamp": self.stamp,
+                    "fonts": self.fonts
+                }, file)
+            # replace the old cache only once the new one is written
+            os.replace(temp, self.filename)
+        except OSError:
+            # fonts can still be found without a cache
+            pass
+
+    def find(self, face, bold=False, italic=False):
+        """ Finds the file of a system font, as pygame.font.SysFont would.
+        face --     (str) The typeface
+        bold --     (bool) Whether the font is bold
+        italic --   (bool) Whether the font is italic
+        returns --  (list) The file (None for pygame's default font),
+                           and whether the font has to be made bold, italic
+                           (e.g. if there is no bold file)
+        """
+        found = []
+        # let SysFont pick the file, and note what it picked
+        def constructor(path, size, set_bold, set_italic):
+            found.extend([path, set_bold, set_italic])
+            return None
+        pygame.font.SysFont(face, 1, bold, italic, constructor)
+        return found
+
+    def get_font(self, face, size, bold=False, italic=False):
+        """ Gets a system font, opening its file directly if it's cached.
+        face --     (str) The typeface
+        size --     (int) The size of the font
+        bold --     (bool) Whether the font is bold
+        italic --   (bool) Whether the font is italic
+        returns --  (object -- pygame.font.Font)
+        """
+        if self.fonts is None:
+            self.read()
+        key = "{0}|{1:d}|{2:d}".format(face, bool(bold), bool(italic))
+        font = None
+        if key in self.fonts:
+            try:
+                font = self.open(*self.fonts[key], size=size)
+            except (OSError, TypeError, ValueError):
+                # the file is gone (or the entry is broken), find it again
+                font = None
+        if font is None:
+            self.fonts[key] = self.find(face, bold, italic)
+            self.write()
+            font = self.open(*self.fonts[key], size=size)
+        return font
+
+    def open(self, path, set_bold, set_italic, size):
+        """ Opens a font file.
+        path --         (str) The file, None for pygame's default font
+        set_bold --     (bool) Whether to make the font bold
+        set_italic --   (bool) Whether to make the font italic
+        size --         (int) The size of the font
+        returns --      (object -- pygame.font.Font)
+        """
+        font = pygame.font.Font(path, size)
+        if set_bold:
+            font.set_bold(True)
+        if set_italic:
+            font.set_italic(True)
+        return font
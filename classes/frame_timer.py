@@ -0,0 +1,164 @@
+# import modules
+import json
+import time
+from array import array
+# define classes
+class RingBuffer(object):
+    """ Keeps the last values added to it, in a fixed amount of memory. """
+
+    def __init__(self, size):
+        """ Constructor
+        size --     (int) The number of values to keep
+        """
+        self.values = array("d", [0.0] * size)
+        # the position the next value is written to
+        self.pos = 0
+        # the number of values ever added
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, len(self.values))
+
+    def add(self, value):
+        """ Adds a value, replacing the oldest value if we are full.
+        value --    (float) The value to add
+        returns --  (None)
+        """
+        self.values[self.pos] = value
+        self.pos = (self.pos + 1) % len(self.values)
+        self.count += 1
+
+    def get_values(self):
+        """ Gets the values we are keeping, oldest first.
+        returns --  (list -- float)
+        """
+        if self.count < len(self.values):
+            return self.values[:self.pos].tolist()
+        return (self.values[self.pos:] + self.values[:self.pos]).tolist()
+
+
+class FrameTimer(object):
+    """ Records how long each phase of each frame of the main loop takes,
+    for the last frames, and counts the frames that took too long.
+    The loop calls start_frame() before the first phase,
+    then mark(phase) as each phase ends.
+    """
+
+    # Define the phases of the main loop, in order
+    PHASES = [
+        "process_events",
+        "run_logic",
+        "display_frame",
+        "update_clock",
+        "update_transitions"
+    ]
+    # Define the percentiles reported
+    PERCENTILES = [50, 95, 99]
+    # Define the upper edges (in ms) of the buckets of the histograms
+    BUCKETS = [0.5, 1, 2, 4, 8, 16.7, 33.3, 50, 100, 250]
+
+    def __init__(self, fps=0, size=3600):
+        """ Constructor
+        fps --      (int) The frames per second the loop aims for,
+                          0 doesn't count dropped frames
+        size --     (int) The number of frames to keep the times of
+        """
+        # store the time each frame should take, in seconds
+        self.budget = 1 / fps if fps else None
+        # store the times (in seconds) of the last frames, by phase
+        self.phases = {}
+        for phase in self.PHASES:
+            self.phases[phase] = RingBuffer(size)
+        self.frames = RingBuffer(size)
+        # count the frames that took longer than the budget,
+        # and the frames that would have been shown in the time they took
+        self.late_frames = 0
+        self.dropped_frames = 0
+        # the time the current frame, and the current phase, started
+        self.frame_start = None
+        self.phase_start = None
+
+    def start_frame(self):
+        """ Starts timing a frame, ending the last frame (if any).
+        returns --  (None)
+        """
+        now = time.perf_counter()
+        # If we were timing a frame, it's over
+        if self.frame_start is not None:
+            frame = now - self.frame_start
+            self.frames.add(frame)
+            # If the frame took longer than we had for it, count it
+            if self.budget is not None and frame > self.budget * 1.5:
+                self.late_frames += 1
+                # (count the frames we could have shown instead)
+                self.dropped_frames += int(frame / self.budget + 0.5) - 1
+        self.frame_start = self.phase_start = now
+
+    def mark(self, phase):
+        """ Records the time since the last mark (or the start of the frame)
+        as the time the phase took.
+        phase --    (str) The phase that just ended, one of PHASES
+        returns --  (None)
+        """
+        now = time.perf_counter()
+        self.phases[phase].add(now - self.phase_start)
+        self.phase_start = now
+
+    def get_percentile(self, values, percentile):
+        """ Gets a percentile of a sorted list of values (nearest rank).
+        values --       (list -- float) The sorted values
+        percentile --   (int) The percentile (0 - 100)
+        returns --      (float) The value, 0 if there are no values
+        """
+        if not values:
+            return 0.0
+        rank = max(1, -(-percentile * len(values) // 100))
+        return values[rank - 1]
+
+    def get_stats(self, buffer):
+        """ Gets the percentiles, max and histogram of a buffer of times.
+        buffer --   (object -- RingBuffer) The times (in seconds)
+        returns --  (dict) The frames counted, times in ms, and histogram as
+                           the number of times up to each bucket's edge
+        """
+        values = sorted(buffer.get_values())
+        stats = {"frames": len(values)}
+        for p in self.PERCENTILES:
+            stats["p{0}_ms".format(p)] = self.get_percentile(values, p) * 1000
+        stats["max_ms"] = values[-1] * 1000 if values else 0.0
+        # count the times in each bucket (and past the last bucket)
+        counts = [0] * (len(self.BUCKETS) + 1)
+        i = 0
+        for value in values:
+            while i < len(self.BUCKETS) and value * 1000 > self.BUCKETS[i]:
+                i += 1
+            counts[i] += 1
+        stats["histogram"] = [
+            [edge, count] for edge, count in zip(self.BUCKETS + [None], counts)
+        ]
+        return stats
+
+    def get_report(self):
+        """ Gets the stats of the frames we kept, by phase and as a whole.
+        returns --  (dict)
+        """
+        report = {
+            "frames": self.frames.count,
+            "budget_ms": self.budget * 1000 if self.budget else None,
+            "late_frames": self.late_frames,
+            "dropped_frames": self.dropped_frames,
+            "frame": self.get_stats(self.frames),
+            "phases": {}
+        }
+        for phase in self.PHASES:
+            report["phases"][phase] = self.get_stats(self.phases[phase])
+        return report
+
+    def save(self, filename):
+        """ Writes the report to a file, as JSON.
+        filename -- (str) The file to write
+        returns --  (None)
+        """
+        with open(filename, "w") as file:
+            json.dump(self.get_report(), file, indent=2)
+            file.write("\n")
@@ -1,11 +1,16 @@
 # Import modules
-import pygame, math, os, sys
+import pygame, math, os, sys, random
 # Import classes
 from .events import Events
 from .panel import Panel
-from .levels import *
+from .levels import Level
+from .level_data import LevelLoader
 from .messages import Messages
 from .high_scores import HighScores
+from .score_screen import ScoreScreen
+from .transitions import Fade, Transitions
+from .replay import Recorder, Playback
+from .overlay import Overlay
 
 class Game(object):
     """ Represents instance of the game.
@@ -37,20 +42,41 @@ class Game(object):
     # Define default values
     defaults = {
         "fps": 60,
+        "tick_rate": 60
     }
+    # Longest frame (in seconds) the game logic will try to catch up on
+    MAX_FRAME_TIME = 0.25
     
-    def __init__ (self, title, pygclock=False, fps=False):
+    def __init__ (self, title, pygclock=False, fps=False, headless=False,
+                  tick_rate=False, dirty_rects=False, snake_model=False,
+                  scores_file=False):
         """
         title --    (str) Used to title game window
-        fps --      (int) Frames per second (e.g. speed) of the game
+        fps --      (int) Max frames per second drawn (0 for no limit)
         pygclock -- (object -- pygame.time.Clock) Used for setting the FPS
+        headless -- (bool) Run only the game logic, without a window, clock,
+                           or any drawing (e.g. for bots and replays)
+        tick_rate --(int) Logic ticks per second (e.g. speed) of the game
+        dirty_rects -- (bool) Only update the parts of the screen that changed
+                              while playing, instead of the whole screen
+        snake_model -- (str) How the snake is kept: "segments" (a sprite per
+                             corner, the default), or "corners" (a slotted
+                             edge per corner, see CompactPlayer)
+        scores_file -- (str) Where the high scores are kept (default:
+                             data/scores.db), see HighScores
         """
         # set and store current working directory
         os.chdir(os.path.dirname(os.path.abspath(sys.argv[0])))
         self.cwd = os.getcwd()
         self.title = title
+        self.headless = headless
+        self.dirty_rects = dirty_rects
+        self.snake_model = snake_model if snake_model else "segments"
         # If we weren't given a clock
-        if pygclock is False:
+        if pygclock is False and headless:
+            # headless games run as fast as they are stepped
+            self.clock = None
+        elif pygclock is False:
             # create a new clock
             self.clock = pygame.time.Clock()
         else:
@@ -60,26 +86,57 @@ class Game(object):
             self.fps = self.defaults["fps"]
         else:
             self.fps = fps
+        # If we weren't passed a tick rate
+        if tick_rate is False:
+            self.tick_rate = self.defaults["tick_rate"]
+        else:
+            self.tick_rate = tick_rate
         # create events object for the game
         self.events = Events()
+        # create scheduler for transitions (e.g. fades)
+        self.transitions = Transitions()
         # set score and lives to 0
         self.score = 0
         self.lives = 0
+        # set the seed of our random number streams, and the streams
+        self.seed = None
+        self.random = {}
+        # count the logic ticks played
+        self.ticks = 0
+        # count the games started (to tell a game from the one before it)
+        self.games = 0
+        # we aren't recording or playing back a replay
+        self.record_file = False
+        self.recorder = None
+        self.playback = None
+        # nobody is waiting to press keys (e.g. a bot plays unattended),
+        # so the game shouldn't wait for them
+        self.unattended = False
         # create dictionary to store colors
         self.colors = {}
         # game is not currently running
         self.screen = False
         self.running = False
         self.game_over = True
-        # initiate levels
+        # the levels are loaded when the first game is (see load)
+        self.level_data = None
+        self.levels = None
         self.current_level = False
-        self.levels = []
         # add event listeners
         self.setup_events()
-        # initialize messages
-        self.messages = Messages(self)
-        # initialize high scores list
-        self.high_scores = HighScores(self.cwd+'/')
+        # create the performance overlay (hidden until toggled)
+        self.overlay = Overlay(self)
+        # Headless games don't display messages or high scores
+        self.messages = None
+        self.high_scores = None
+        self.score_screen = None
+        if not headless:
+            # initialize messages
+            self.messages = Messages(self)
+            # initialize high scores list
+            self.high_scores = HighScores(self.cwd+'/', scores_file)
+            # initialize the high score entry and list
+            self.score_screen = ScoreScreen(self)
         # initialize structure
         self.board = False
         self.panel = False
@@ -89,18 +146,27 @@ class Game(object):
         # Move player
         @self.events.listener(pygame.KEYDOWN)
         def e_handle_move(e):
-            if not self.game_over and not self.paused:
+            # (the player doesn't control a replay)
+            if not self.game_over and not self.paused and self.playback is None:
                 if e.key == pygame.K_LEFT:
-                    self.get_level().player.move_left()
+                    self.move_player("left")
                 if e.key == pygame.K_RIGHT:
-                    self.get_level().player.move_right()
+                    self.move_player("right")
                 if e.key == pygame.K_UP:
-                    self.get_level().player.move_up()
+                    self.move_player("up")
                 if e.key == pygame.K_DOWN:
-                    self.get_level().player.move_down()
+                    self.move_player("down")
         # Handle pause and restart
         @self.events.listener(pygame.KEYDOWN)
         def e_handle_pause_restart(e):
+            # Keys are for the high scores while they are shown
+            if self.is_showing_scores():
+                return
+            # If space was pressed during a transition
+            if e.key == pygame.K_SPACE and self.transitions.is_active():
+                # skip the transition, (still paused or game over)
+                self.transitions.skip()
+                return
             # If space was pressed
             if e.key == pygame.K_SPACE:
                 # Restart when game over
@@ -113,6 +179,16 @@ class Game(object):
             if not self.paused and e.key == pygame.K_p:
                 # pause game
                 self.paused = True
+        # Enter a name for, and show, the high scores
+        @self.events.listener(pygame.KEYDOWN)
+        def e_handle_scores(e):
+            if self.is_showing_scores():
+                self.score_screen.handle_key(e)
+        # Show or hide the performance overlay
+        @self.events.listener(pygame.KEYDOWN)
+        def e_handle_overlay(e):
+            if e.key == pygame.K_F3:
+                self.overlay.toggle()
         # Exit game on close
         @self.events.listener(pygame.QUIT)
         def e_handle_exit(e):
@@ -132,10 +208,15 @@ class Game(object):
         return self.score
         
     def get_level(self):
-        """ Get the current level in the list of levels
+        """ Get the current level in the list of levels,
+        creating it if it hasn't been played yet
         returns -- (object Level) The current level
         """
-        return self.levels[self.current_level]
+        level = self.levels[self.current_level]
+        if level is None:
+            level = self.levels[self.current_level] = \
+                Level(self, self.level_data[self.current_level])
+        return level
     
     def is_running(self):
         """ Check if loop is still active
@@ -143,6 +224,50 @@ class Game(object):
         """
         return self.running
     
+    def is_showing_scores(self):
+        """ Check if the high score entry or list is shown
+        returns -- (bool)
+        """
+        return self.score_screen is not None and self.score_screen.is_open()
+    
+    def get_random(self, name):
+        """ Get one of the game's random number streams.
+        Each stream is seeded from the game's seed and its name,
+        so a game played with the same seed gets the same numbers.
+        name --     (str) The name of the stream (e.g. "mice")
+        returns --  (object -- random.Random)
+        """
+        if name not in self.random:
+            self.random[name] = random.Random("{0}/{1}".format(self.seed, name))
+        return self.random[name]
+    
+    def move_player(self, direction):
+        """ Moves the player (and records the move if we are recording).
+        direction -- (str) "left", "right", "up", or "down"
+        returns --   (none)
+        """
+        if self.recorder is not None:
+            self.recorder.record(self.ticks, direction)
+        getattr(self.get_level().player, "move_" + direction)()
+    
+    def record(self, filename):
+        """ Records every game from now on, saving each one to a replay file
+        when it ends (each game replaces the last).
+        filename -- (str) The file to save the replay to
+        returns --  (none)
+        """
+        self.record_file = filename
+    
+    def play(self, replay):
+        """ Loads and plays back a recorded game.
+        replay --   (object -- Replay) The recorded game
+        returns --  (none)
+        """
+        self.playback = Playback(replay)
+        # the game must run at the speed it was recorded at
+        self.tick_rate = replay.tick_rate
+        self.load(replay.seed)
+    
     def add_points(self, points):
         """ Add points to score
         points --   (int) The points to add
@@ -151,17 +276,29 @@ class Game(object):
         self.score += int(points)
         return self.get_score()
     
-    def load (self):
+    def load (self, seed=None):
         """ Opens a window and loads resources for game.
-        size --     (list) The width, height of the game window
+        seed --     (int) (optional) The seed for the game's random numbers,
+                          defaults to a new random seed
         returns --  (bool) Whether or not load was successful
         """
         # start game
         self.game_over = False
         self.paused = True
+        self.games += 1
         # Reset score and lives
         self.score = 0
         self.lives = 0
+        # Reset random number streams and ticks
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.random = {}
+        self.ticks = 0
+        # If we are recording (and not playing back), start a new recording
+        self.recorder = None
+        if self.record_file and self.playback is None:
+            self.recorder = Recorder(seed, self.tick_rate, self.record_file)
         # set game colors
         self.colors.update({
             "fill": self.BLACK,
@@ -172,25 +309,32 @@ class Game(object):
             "panel_text": self.WHITE
         })
         
-        # Create structure
-        self.board = pygame.Surface(self.BOARD_SIZE)
-        self.panel = Panel(self)
-        # Create levels
-        self.levels = [
-            Level_01(self), Level_02(self), Level_03(self), Level_04(self),
-            Level_05(self), Level_06(self), Level_07(self), Level_08(self),
-            Level_09(self)
-        ]
-        # Load level 1
+        # Create structure (once, it's reused when we restart)
+        if not self.headless and not self.board:
+            self.board = pygame.Surface(self.BOARD_SIZE)
+            self.panel = Panel(self)
+        elif not self.headless:
+            # the panel must be redrawn for the new game
+            self.panel.invalidate()
+        
+        # If we don't have a window yet
+        if not self.headless and not self.screen:
+            # set title
+            pygame.display.set_caption(self.title)
+            # create dispaly (open window)
+            self.screen = pygame.display.set_mode(self.WINDOW_SIZE)
+            # hide mouse
+            pygame.mouse.set_visible(False)
+        # If this is the first game, load the levels, compiled from their
+        # definitions in data/ (each level is created when first played,
+        # then kept)
+        if self.level_data is None:
+            self.level_data = LevelLoader(self, self.cwd + '/').load()
+            self.levels = [None] * len(self.level_data)
+        # Load level 1 (after the display, so images can match its format)
+        # (levels already played are kept, and reset when loaded)
         self.current_level = 0
         self.get_level().load()
-             
-        # set title
-        pygame.display.set_caption(self.title)
-        # create dispaly (open window)
-        self.screen = pygame.display.set_mode(self.WINDOW_SIZE)
-        # hide mouse
-        pygame.mouse.set_visible(False)
         # game is now running
         self.running = True
         
@@ -203,24 +347,32 @@ class Game(object):
             # All levels are complete, game over
             self.end()
             return
+        # Pause game
+        self.paused = True
+        # If we are running headless
+        if self.headless:
+            # Skip drawing and load new level
+            self.current_level += 1
+            self.get_level().load()
+            return
         # draw message
         message = self.messages.draw_level_complete()
         # draw level
         self.get_level().draw(self.board)
+        # function to load the next level once the level has faded out
+        def load_next():
+            # Update level
+            self.current_level += 1
+            # Load new level
+            self.get_level().load()
+            # Update panel
+            if self.panel.draw():
+                self.screen.blit(self.panel, self.PANEL_POS)
+            # draw and fade in new level
+            self.get_level().draw(self.board)
+            self.fade_in([self.board], [message], 1)
         # Fade out level, don't fade message
-        self.fade_out([self.board], [message], 4)
-        # Pause game
-        self.paused = True
-        # Update level
-        self.current_level += 1
-        # Load new level
-        self.get_level().load()
-        # Update panel
-        self.panel.draw()
-        self.screen.blit(self.panel, self.PANEL_POS)
-        # draw and fade in new level
-        self.get_level().draw(self.board)
-        self.fade_in([self.board], [message], 1)
+        self.fade_out([self.board], [message], 4, load_next)
                 
     def process_events (self):
         """ Processes all of the in game events.
@@ -231,28 +383,61 @@ class Game(object):
             # Call the handler for the event
             # (If no handler exists, nothing will be done)
             self.events.handle(event.type, event)
+        # Handle any high scores read or written in the background
+        if self.high_scores is not None:
+            self.high_scores.update()
             
     def run_logic (self):
         """ Execute any game logic (e.g. object positions, player attributes)
         returns --  (none)
         """
+        # time the logic, for the performance overlay
+        self.overlay.start("logic")
+        # Replays and unattended games don't wait for the player to continue
+        # (at the start, and after transitions)
+        if ((self.playback is not None or self.unattended)
+                and not self.transitions.is_active()):
+            self.paused = False
         # If the game isn't over and isn't paused
         if not self.game_over and not self.paused:
+            # make any recorded moves for this tick
+            if self.playback is not None:
+                self.playback.feed(self)
             # update level
             self.get_level().update()
+            # count tick
+            self.ticks += 1
+        self.overlay.stop("logic")
         
-    def display_frame (self):
+    def display_frame (self, alpha=1):
         """ Display all the graphics in this frame
-        fill --     (list) Screen fill (background) color in RGB values
+        alpha --    (float) How far (0 - 1) we are from the last logic tick
+                            to the next, used to interpolate movement
         returns --  (none)
         """
-        # draw panel
-        self.panel.draw()
+        # Headless games have nothing to display
+        if self.headless:
+            return
+        # time the drawing, for the performance overlay
+        self.overlay.start("render")
+        # If a transition is running, display it instead
+        if self.transitions.is_active():
+            self.transitions.draw(self.board)
+            self.screen.blit(self.board, self.BOARD_POS)
+            self._present()
+            return
+        # If we are only updating what changed, and we are playing
+        if self.dirty_rects and not self.game_over and not self.paused:
+            self._display_dirty(alpha)
+            return
+        # draw panel, and blit it to screen if anything on it changed
+        if self.panel.draw():
+            self.screen.blit(self.panel, self.PANEL_POS)
         
         # If the game is NOT over
         if not self.game_over:
             # draw level
-            self.get_level().draw(self.board)
+            self.get_level().draw(self.board, alpha=alpha)
             # If the game is paused
             if self.paused:
                 # draw a pause message to a screen
@@ -261,104 +446,155 @@ class Game(object):
             # create game over message
             message = self.messages.draw_game_over()
             self.board.blit(message, [0, 0])
+            # draw the high score entry or list over it (if shown)
+            self.score_screen.draw(self.board)
         
-        # Fill the screen with fill color
-        self.screen.fill(self.colors["fill"])
-        # Blit panel and board to screen
-        self.screen.blit(self.panel, self.PANEL_POS)
+        # Blit board to screen
+        # (the panel and board cover the whole screen, so it isn't filled,
+        # and the panel left on screen from the last frame is kept)
         self.screen.blit(self.board, self.BOARD_POS)
         
         # update the graphics
-        pygame.display.flip()
+        self._present()
+        # the next dirty frame can't build on this one (e.g. it has messages)
+        if not self.game_over:
+            self.get_level().forget_drawn()
+    
+    def _display_dirty (self, alpha=1):
+        """ Display only the graphics that changed since the last frame.
+        alpha --    (float) See display_frame
+        returns --  (none)
+        """
+        # store the areas of the screen that changed
+        changed = []
+        # draw panel, and blit it to screen if anything on it changed
+        if self.panel.draw():
+            changed.append(self.screen.blit(self.panel, self.PANEL_POS))
+        # draw the parts of the level that changed
+        for rect in self.get_level().draw_dirty(self.board, alpha):
+            # copy the changed part of the board to the screen
+            changed.append(
+                self.screen.blit(self.board, rect.move(self.BOARD_POS), rect)
+            )
+        # update only the changed graphics
+        self._present(changed)
+    
+    def _present (self, changed=None):
+        """ Draws the performance overlay (if shown) over the board on the
+        screen, and updates the display.
+        changed --  (list) The rects of the screen that changed,
+                           None updates the whole screen
+        returns --  (none)
+        """
+        # the frame is drawn, the overlay doesn't count itself
+        self.overlay.stop("render")
+        rects = self.overlay.draw(self.screen, self.board, self.BOARD_POS)
+        # update the graphics
+        if changed is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(changed + rects)
+        self.overlay.end_frame()
         
-    def _fade(self, fades=[], direction="out", noFades=[], speed=1.5):
+    def _fade(self, fades=[], direction="out", noFades=[], speed=1.5,
+              on_done=None):
         """ Take a PyGame Surface and slowly fade it in or out.
-        This runs an internal game loop for the duration of the fade.
+        The fade runs after any running transitions, one frame at a time.
         fades --     (list) A list of PyGame surfaces to fade
         direction -- (str) "in" or "out" (If not "in", assumes "out")
         noFades --   (list) A list of PyGame surfaces that don't fade
         speed --     (float) The number of seconds for the fade to last
+        on_done --   (callable) Called once the fade is over (or skipped)
         returns --  (none)
         """
-        # Create surfaces to store graphics
-        fade = pygame.Surface(self.BOARD_SIZE)
-        noFade = pygame.Surface(self.BOARD_SIZE)
-        # Make fade transparent
-        fade.fill(self.BLACK)
-        fade.set_colorkey(self.BLACK)
-        # add fades to fade surface
-        for s in fades:
-            fade.blit(s, [0, 0])
-        # add no fades to noFade surface
-        for s in noFades:
-            noFade.blit(s, [0, 0])
-        # Calculate number of frames for the fade to last
-        frames = math.ceil(speed * self.fps)
-        # Calculate how to spread 255 over our number of frames
-        step = 255/frames
-        # Iterate for each frame
-        # -- Start internal game loop --
-        for i in range(0, frames):
-            # Determine our current alpha for this frame based on step
-            a = math.ceil(i * step)
-            # Set alpha (fade in our out)
-            alpha = (0 + a) if direction == "in" else (255 - a) 
-            # Set fade level for fade surface
-            fade.set_alpha(alpha)
-            # Fill the board with fill color
-            self.board.fill(self.colors["fill"])
-            # Copy surfaces to screen
-            self.board.blit(noFade, [0, 0])
-            self.board.blit(fade, [0, 0])
-            self.screen.blit(self.board, self.BOARD_POS)
-            # flush events so program stays responsive
-            pygame.event.get()
-            # update graphics
-            pygame.display.flip()
-            # tick clock
-            self.update_clock()
+        # Headless games have nothing to fade, the fade is over right away
+        if self.headless:
+            if callable(on_done):
+                on_done()
+            return
+        # add the fade to our transitions
+        self.transitions.add(
+            Fade(self, fades, direction, noFades, speed, on_done)
+        )
     
-    def fade_in(self, fades=[], noFades=[], speed=1.5):
+    def fade_in(self, fades=[], noFades=[], speed=1.5, on_done=None):
         """ Take a PyGame Surface and slowly fade it in.
-        args -- fades(list), noFades(list), speed(int) See Game._fade docstring.
+        args -- fades(list), noFades(list), speed(int), on_done(callable)
+                See Game._fade docstring.
         returns --  (none)
         """
-        # Use internal fade method, uses internal game loop
-        self._fade(fades, "in", noFades, speed)
+        self._fade(fades, "in", noFades, speed, on_done)
         
-    def fade_out(self, fades=[], noFades=[], speed=1.5):
+    def fade_out(self, fades=[], noFades=[], speed=1.5, on_done=None):
         """ Take a PyGame Surface and slowly fade it out.
-        args -- fades(list), noFades(list), speed(int) See Game._fade docstring.
+        args -- fades(list), noFades(list), speed(int), on_done(callable)
+                See Game._fade docstring.
+        returns --  (none)
+        """
+        self._fade(fades, "out", noFades, speed, on_done)
+    
+    def update_transitions (self, elapsed):
+        """ Advances any running transitions (e.g. fades).
+        elapsed --  (float) The number of seconds since the last frame
         returns --  (none)
         """
-        # Use internal fade method, uses internal game loop
-        self._fade(fades, "out", noFades, speed)
+        self.transitions.update(elapsed)
         
     def update_clock (self):
         """ Updates the PyGame clock and delays loop to maintain max FPS
-        returns -- (none)
+        returns -- (float) The number of seconds since the last frame,
+                           at most MAX_FRAME_TIME
         """
-        self.clock.tick(self.fps)
+        # Headless games without a clock don't wait,
+        # every frame is exactly one logic tick
+        if self.clock is None:
+            return 1 / self.tick_rate
+        # tick clock, get time passed in seconds
+        elapsed = self.clock.tick(self.fps) / 1000
+        # Don't try to catch up on very long frames
+        return min(elapsed, self.MAX_FRAME_TIME)
     
     def end (self):
         """ Ends the current game and displays game over message. """
         # Game is now over
         self.game_over = True
+        # If we are recording, finish (and save) the recording
+        if self.recorder is not None:
+            self.recorder.finish(self.ticks, self.score)
+        # Headless games don't display messages or check high scores
+        if self.headless:
+            return
         # draw message
         message = self.messages.draw_game_over()
         # draw and fade out level
         level = pygame.Surface(self.BOARD_SIZE)
         self.get_level().draw(level)
         self.fade_out([level])
-        # fade in message
-        self.fade_in([message])
-        # Check high scores
-        self.high_scores.check_high_score(self.score)
+        # Replays and unattended games don't get high scores
+        if self.playback is not None or self.unattended:
+            self.fade_in([message])
+            return
+        # fade in message, then check high scores
+        score = self.score
+        game = self.games
+        def open_entry(score):
+            # The check finishes later, only ask for a name if this game
+            # is still over (the player may have restarted since)
+            if self.game_over and self.games == game:
+                self.score_screen.open_entry(score)
+        self.fade_in(
+            [message],
+            on_done=lambda: self.high_scores.check_high_score(score, open_entry)
+        )
         
     def restart (self):
-        # Reload game
+        # Stop playing back any replay, and reload game
+        self.playback = None
         self.load()
     
     def stop (self):
         """ Stop the game """
         self.running = False
+        # Finish writing any high scores
+        if self.high_scores is not None:
+            self.high_scores.close()
@@ -1,273 +1,169 @@
 # import modules
-import tkinter
-from tkinter import ttk
-import json
 import os
-# import classes
+import queue
+import sys
+import threading
+import traceback
 
 # define class
 class HighScores(object):
-    """ Reads, displays, updates, and writes high scores for a game.
+    """ Reads and writes the high scores for a game.
+    The high scores db is only used by a worker thread, so reading and
+    writing never holds up the game. Each request is passed to the worker,
+    and its result is passed back to a callback, called by update()
+    on the game's thread.
     Inherits -- object
     """
-    #Define basic colors
-    BLACK   = (0x00, 0x00, 0x00)
-    WHITE   = (0xFF, 0xFF, 0xFF)
-    GREY    = (0xBB, 0xBB, 0xBB)
-    
+
+    # The number of high scores shown (every score is kept)
     max_scores = 15
-    
-    def __init__(self, directory='', location=False):
-        """ Reads the high scores from the file at the specified location.
+    # The location of the high scores db
+    location = "data/scores.db"
+    # The location of the JSON high scores list kept by older versions,
+    # copied into a new db
+    old_location = "data/scores.dat"
+
+    def __init__(self, directory='', location=False, store=False):
+        """ Starts the worker for the high scores db at the specified location.
         directory --    (str) The directory to prepend to the location
-        location --     (str) (optional) The location of the high scores db
+        location --     (str) (optional) The location of the high scores db,
+                              a .dat or .json location is kept as a JSON list
+                              of only the high scores shown, a .journal
+                              location as an append-only journal
+        store --        (object -- ScoreStore) (optional) The store to keep
+                              the high scores in, instead of the location
         """
-        # Store location
+        # Store location (an absolute location isn't in the directory)
         if location:
-            self.filename = directory + location
+            self.filename = os.path.join(directory, location)
         else:
-            self.filename = directory + "data/scores.dat"
-        # initialize window
-        self.root = None
-        self.open = False
-        
-        # open the high scores db
-        file = open(self.filename, 'r')
-        # parse the high scores db
-        self.list = json.load(file)
-        # close the db
-        file.close()
-    
-    def add_score(self, name, score):
-        """ Adds a score to the list.
-        name --     (str) The name of the person who scored.
-        score --    (int) The score to add.
-        returns --  (None)
+            self.filename = directory + self.location
+        self.old_filename = directory + self.old_location
+        # the db is opened by the worker, when it is first used
+        # (some stores can only be used by the thread that opened them)
+        self.store = None if store is False else store
+        # store the requests waiting for the worker, as [request, callback],
+        # and the results waiting for update(), as [callback, result]
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.worker = None
+
+    def open_store(self, filename, old_filename=False):
+        """ Opens the store for a high scores db, creating it if needed.
+        filename --     (str) The location of the high scores db
+        old_filename -- (str) (optional) The location of a JSON list to copy
+                              into the db when it is created
+        returns --      (object -- ScoreStore)
         """
-        # append the score
-        self.list.append([name, score])
-        # sort the list
-        self.list.sort(key=lambda v: v[1], reverse=True)
-        # If we already have max scores
-        if len(self.list) > self.max_scores:
-            # remove the last (lowest) score
-            self.list = self.list[:-1]
-        # open the db
-        file = open(self.filename, 'w')
-        # write the new list
-        json.dump(self.list, file)
-        # close the db
-        file.close()
-    
-    def get_game_window_pos(self):
-        """ Attempts to get the position of the window of the parent game.
-        returns --  (tuple) x, y coordinates of the window.
-                            If we can't get the position, returns (0, 0)
+        # import the stores (and the db modules they use) when first needed
+        from .score_store import JSONScoreStore, SQLiteScoreStore, JournalScoreStore
+        # JSON lists only keep the high scores shown
+        extension = os.path.splitext(filename)[1]
+        if extension in [".dat", ".json"]:
+            return JSONScoreStore(filename, self.max_scores)
+        new = not os.path.exists(filename)
+        if extension == ".journal":
+            store = JournalScoreStore(filename)
+        else:
+            store = SQLiteScoreStore(filename)
+        # copy the scores from older versions into a new db
+        if new and old_filename and os.path.exists(old_filename):
+            for score in JSONScoreStore(old_filename).list:
+                store.add(score[0], score[1])
+        return store
+
+    def _work(self):
+        # Handle requests until we are closed (sent None)
+        while True:
+            item = self.requests.get()
+            if item is None:
+                break
+            request, callback = item
+            try:
+                # open the db the first time it's needed
+                if self.store is None:
+                    self.store = self.open_store(
+                        self.filename, self.old_filename
+                    )
+                result = request(self.store)
+            except Exception:
+                # a broken db shouldn't stop the game, report it and go on
+                # (telling the callback the request failed)
+                traceback.print_exc(file=sys.stderr)
+                result = None
+            if callback is not None:
+                self.results.put([callback, result])
+        if self.store is not None:
+            self.store.close()
+
+    def request(self, request, callback=None):
+        """ Passes a request to the worker, starting the worker if needed.
+        request --  (function) Called by the worker with the ScoreStore
+        callback -- (function) (optional) Called by update() with the result
+                               (None if the request failed)
+        returns --  (None)
         """
-        """ PyGame uses the SDL library to display graphics.
-            The following documentation reference the
-            "SDL_VIDEO_WINDOW_POS" environment variable:
-            http://www.pygame.org/wiki/SettingWindowPosition
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._work, daemon=True)
+            self.worker.start()
+        self.requests.put([request, callback])
+
+    def update(self):
+        """ Calls the callbacks of the requests the worker has finished.
+        Called by the game's thread (e.g. every frame).
+        returns --  (None)
         """
-        if "SDL_VIDEO_WINDOW_POS" in os.environ:
-            x, y = os.environ["SDL_VIDEO_WINDOW_POS"].split(", ")
-            return (x, y)
-        return (0, 0)
-        
-    def open_list(self, title=False):
-        """ Opens and displays the high scores list in a Tk window.
-        title --    (str) (optional) The title of the window
+        while True:
+            try:
+                callback, result = self.results.get_nowait()
+            except queue.Empty:
+                return
+            callback(result)
+
+    def close(self):
+        """ Waits for the worker to finish the requests it was passed,
+        and closes the db.
         returns --  (None)
         """
-        # set title
-        title = title if title else "High Scores"
-        # get position of window
-        win_pos = (500, 250)
-        # set size of window
-        win_size = (300, 450)
-        
-        # create high scores window
-        self.root = tkinter.Tk()
-        self.root.title(title)
-        # formate geometry string for window
-        win_geo = "{}x{}+{}+{}"\
-                  .format(win_size[0], win_size[1], win_pos[0], win_pos[1])
-        # set position and size of window
-        self.root.geometry(win_geo)
-        # lock window size
-        self.root.resizable(False, False)
-        
-        # Create main high scores frame
-        mframe = ttk.Frame(self.root,
-            padding="10"
-        )
-        # Create content frame
-        content = ttk.LabelFrame(mframe,
-            text="High Scores",
-            labelanchor="n",
-            padding=(5),
-            borderwidth=2,
-            relief='sunken'
-        )
-        # Create options frame
-        options = ttk.Frame(mframe,
-            padding=5
-        )
-        # create cancel button
-        cancel = ttk.Button(options,
-            text="Cancel",
-            default="active",
-            command=self.close_list
-        )   
-        
-        # Create base layout
-        mframe.pack(
-            fill="both"
-        )
-        content.pack(
-            fill="x"
-        )
-        content.grid_propagate(False)
-        content["height"] = win_size[1] - 100
-        options.pack(
-            fill="x",
-            pady=(30, 0)
-        )
-        
-        # Create high scores content
-        for i in range(len(self.list)):
-            score = self.list[i]
-            ttk.Label(content, text=str(i+1) + ". ").grid(
-                row=i,
-                column=0,
-                sticky=(tkinter.W),
-                pady=1
-            )
-            ttk.Label(content, text=score[0]).grid(
-                row=i,
-                column=1,
-                sticky=(tkinter.W),
-                padx=(0, 10)
-            )
-            ttk.Label(content, text=score[1]).grid(
-                row=i,
-                column=2,
-                sticky=(tkinter.W)
-            )
-        
-        # Create options content
-        cancel.pack()
-        
-        # Open the window
-        self.root.mainloop()
-        # We are now open
-        self.open = True
-    
-    def close_list(self):
-        """ Closes the high scores list.
+        if self.worker is not None:
+            self.requests.put(None)
+            self.worker.join()
+            self.worker = None
+
+    def add_score(self, name, score, callback=None):
+        """ Adds a score to the list, then gets the list.
+        name --     (str) The name of the person who scored.
+        score --    (int) The score to add.
+        callback -- (function) (optional) Called with the list, see get_list
+                               (None if the score couldn't be saved)
         returns --  (None)
         """
-        # Destroy the window
-        self.root.destroy()
-        # We are no longer open
-        self.open = False
-    
-    def open_submit_score(self, score, title=False):
-        """ Opens the submit score form in a Tk window.
-        score --    (int) The score to submit
-        title --    (str) (optional) The title of the window
+        def add(store):
+            store.add(name, score)
+            return store.top(self.max_scores)
+        self.request(add, callback)
+
+    def get_list(self, callback):
+        """ Gets the high scores shown.
+        callback -- (function) Called with the highest max_scores scores,
+                               as a list of [name, score]
+                               (None if they couldn't be read)
         returns --  (None)
         """
-        # set title
-        title = title if title else "New High Score! Enter Your Name: "
-        # get position of window
-        win_pos = (500, 250)
-        # set size of window
-        win_size = (450, 150)
-        
-        # create high scores window
-        self.root = tkinter.Tk()
-        self.root.title(title)
-        # formate geometry string for window
-        win_geo = "{}x{}+{}+{}"\
-                  .format(win_size[0], win_size[1], win_pos[0], win_pos[1])
-        # set position and size of window
-        self.root.geometry(win_geo)
-        # lock window size
-        self.root.resizable(False, False)
-        
-        # Create main frame
-        mframe = ttk.Frame(self.root,
-            padding="10"
-        )
-        # Create form
-        label = ttk.Label(mframe,
-            text="Congratulations, new high score! \
-Enter your name below: "
-        )
-        #create input
-        name = tkinter.StringVar()
-        nameinput = ttk.Entry(mframe,
-            width=50,
-            textvariable=name
-        )
-        nameinput.insert(0, "Your Name Here")
-        # Auto select entry
-        nameinput.focus()
-        nameinput.selection_range(0, tkinter.END)
-        def submit_score(*args):
-            # close the open window
-            self.close_list()
-            # add the score
-            self.add_score(name.get(), score)
-            # open the list
-            self.open_list()
-        submit = ttk.Button(mframe,
-            text="Submit",
-            default="active",
-            command=submit_score
-        )
-        self.root.bind('<Return>', submit_score)
+        self.request(lambda store: store.top(self.max_scores), callback)
 
-        # Layout
-        mframe.grid(
-            row=0,
-            column=0
-        )
-        label.grid(
-            row=0,
-            column=0,
-            padx=50,
-            pady=10,
-            sticky=(tkinter.W)
-        )
-        nameinput.grid(
-            row=1,
-            column=0
-        )
-        submit.grid(
-            row=2,
-            column=0
-        )
-        
-        # open window
-        self.root.mainloop()
-        # we are now open
-        self.open = True
-        
-        
-    
-    def check_high_score(self, score):
+    def check_high_score(self, score, callback):
         """ Checks and sees if a score is high enough to be on the list.
         score --    (int) The score to check for placement.
+        callback -- (function) Called with the score, if it is high enough
         returns --  (none)
         """
-        # The list should be sorted,
-        # if the score is higher than the last item
-        # Or if we aren't full of scores yet
-        num = len(self.list)
-        if score > self.list[num-1][1] or num < self.max_scores:
-            # Then submit the score
-            self.open_submit_score(score)
-        
-        
\ No newline at end of file
+        # If the score is higher than the last high score shown
+        # Or if we aren't showing max scores yet
+        def check(store):
+            return store.qualifies(score, self.max_scores)
+        def checked(qualifies):
+            # Then let the player submit the score
+            if qualifies:
+                callback(score)
+        self.request(check, checked)
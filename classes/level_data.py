@@ -0,0 +1,327 @@
+# import modules
+import ast
+import hashlib
+import operator
+import os
+import struct
+# import classes
+from .wall import Wall
+from .levels import Level
+from .occupancy_map import OccupancyMap
+# Define the compiled levels cache format
+MAGIC = b"SNKL"
+VERSION = 1
+# header after the magic: version, key, columns, rows, number of levels
+HEADER = struct.Struct("<B32sHHH")
+# each level, after its id: color, number of walls, number of free cells,
+# player x, y, length, thickness, speed, accel, mice, mice to finish
+LEVEL = struct.Struct("<3BHHddHHddHH")
+# each wall: color, x, y, width, height
+WALL = struct.Struct("<3Biiii")
+# Define the operators numbers in a level definition can use, by ast node
+OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv
+}
+
+
+def evaluate(expression, names):
+    """ Works out a number in a level definition, which can be arithmetic
+    of numbers and names (e.g. "bcx - 50").
+    expression --   (str) The number
+    names --        (dict) The value of each name that can be used
+    returns --      (int|float)
+    """
+    def value(node):
+        if isinstance(node, ast.Constant) and type(node.value) in [int, float]:
+            return node.value
+        if isinstance(node, ast.Name) and node.id in names:
+            return names[node.id]
+        if isinstance(node, ast.BinOp) and type(node.op) in OPERATORS:
+            op = OPERATORS[type(node.op)]
+            return op(value(node.left), value(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -value(node.operand)
+        raise ValueError(
+            "Can't work out {0!r} in a level definition".format(expression)
+        )
+    return value(ast.parse(expression.strip(), mode="eval").body)
+
+
+class LevelData(object):
+    """ A level, compiled from its definition: everything about it that
+    doesn't change while it is played.
+    """
+
+    def __init__(self, id, color, player_props, num_mice, mice_finish,
+                 walls, free, rows=0):
+        """ Constructor
+        id --           (str) The id of the level
+        color --        (tuple) Background color of level in RGB values
+        player_props -- (dict) The player's starting "pos", "size" (length,
+                               thickness), "speed", and "accel"
+        num_mice --     (int) The number of mice on the board
+        mice_finish --  (int) The number of mice to eat to finish the level
+        walls --        (list) The walls, as [color, [x, y], [width, height]]
+        free --         (list) The cells mice can be placed in when only the
+                               walls are on the board, see OccupancyMap
+                        (bytes) The cells, encoded as in the cache, to be
+                                decoded when the level is first played
+        rows --         (int) The number of rows on the board, to decode
+                              encoded cells with
+        """
+        self.id = id
+        self.color = color
+        self.player_props = player_props
+        self.num_mice = num_mice
+        self.mice_finish = mice_finish
+        self.walls = walls
+        self._free = free
+        self.rows = rows
+
+    @property
+    def free(self):
+        """ Gets the cells mice can be placed in when only the walls are on
+        the board, decoding them the first time they are needed.
+        returns --  (list) The cells, as (column, row)
+        """
+        if isinstance(self._free, bytes):
+            cells = struct.unpack("<{0}H".format(len(self._free) // 2), self._free)
+            self._free = [divmod(cell, self.rows) for cell in cells]
+        return self._free
+
+
+class LevelLoader(object):
+    """ Loads the levels of a game from data/levels.xml.
+    Compiling the definitions means placing every wall on the board, so the
+    compiled levels are cached in a binary file, keyed by a hash of the
+    definitions (and the board they were compiled for). The cache is used
+    until the definitions change.
+    """
+
+    # The location of the level definitions
+    location = "data/levels.xml"
+    # The location of the compiled levels
+    cache_location = "data/cache/levels.bin"
+
+    def __init__(self, game, directory=''):
+        """ Constructor
+        game --         (object -- Game) The game the levels are for
+        directory --    (str) The directory to prepend to the locations
+        """
+        self.game = game
+        self.filename = directory + self.location
+        self.cache_filename = directory + self.cache_location
+        # the board, and the cells mice are placed in
+        self.b_size = game.BOARD_SIZE
+        self.cell_size = Level.MOUSE_SIZE
+        self.columns = self.b_size[0] // self.cell_size
+        self.rows = self.b_size[1] // self.cell_size
+
+    def load(self):
+        """ Loads the levels, from the cache if the definitions haven't
+        changed since it was written, compiling (and caching) them if they have.
+        returns --  (list) The levels, as LevelData, in order
+        """
+        with open(self.filename, 'rb') as file:
+            definitions = file.read()
+        key = self.get_key(definitions)
+        levels = self.read_cache(key)
+        if levels is None:
+            # import the xml parser (only needed when compiling)
+            import xml.etree.ElementTree as ET
+            levels = self.compile(ET.fromstring(definitions))
+            self.write_cache(key, levels)
+        return levels
+
+    def get_key(self, definitions):
+        """ Gets the key of the compiled levels, which changes whenever
+        anything they are compiled from does.
+        definitions --  (bytes) The contents of the level definitions
+        returns --      (bytes) The sha256 digest of the definitions
+        """
+        key = hashlib.sha256(definitions)
+        # the board and colors the numbers and names are worked out from
+        key.update(repr([
+            VERSION, self.b_size, self.cell_size, sorted(self.get_colors().items())
+        ]).encode())
+        return key.digest()
+
+    def get_colors(self):
+        """ Gets the named colors a level definition can use.
+        returns --  (dict) The RGB values of each color, by name
+        """
+        colors = {}
+        for name in dir(self.game):
+            value = getattr(self.game, name)
+            if name.isupper() and isinstance(value, tuple) and len(value) == 3:
+                colors[name] = value
+        return colors
+
+    def get_color(self, name):
+        """ Gets a color in a level definition.
+        name --     (str) The name of a color, or "#rrggbb"
+        returns --  (tuple) The color's RGB values
+        """
+        if name.startswith("#") and len(name) == 7:
+            return tuple(int(name[i:i+2], 16) for i in [1, 3, 5])
+        colors = self.get_colors()
+        if name not in colors:
+            raise ValueError("Unknown color {0!r} in a level definition".format(name))
+        return colors[name]
+
+    def compile(self, root):
+        """ Compiles the level definitions.
+        root --     (object -- xml.etree.ElementTree.Element) The <levels>
+        returns --  (list) The levels, as LevelData, in order
+        """
+        w, h = self.b_size
+        names = {"w": w, "h": h, "bcx": w/2, "bcy": h/2}
+        def number(element, attribute):
+            return evaluate(element.attrib[attribute], names)
+        levels = []
+        for definition in root.iter("level"):
+            color = self.get_color(definition.get("color", "BLACK"))
+            wall_color = self.get_color(definition.get("wall_color", "BLUE"))
+            player = definition.find("player")
+            player_props = {
+                "pos": [number(player, "x"), number(player, "y")],
+                "size": [number(player, "length"), number(player, "thickness")],
+                "speed": number(player, "speed"),
+                "accel": number(player, "accel")
+            }
+            mice = definition.find("mice")
+            # every level is walled in
+            walls = [
+                [wall_color, [0, 0], [w, 20]],
+                [wall_color, [w-20, 20], [20, h-40]],
+                [wall_color, [0, h-20], [w, 20]],
+                [wall_color, [0, 20], [20, h-40]]
+            ]
+            for wall in definition.iter("wall"):
+                walls.append([
+                    self.get_color(wall.attrib["color"]),
+                    [number(wall, "x"), number(wall, "y")],
+                    [number(wall, "width"), number(wall, "height")]
+                ])
+            # place the walls on the board, to find the cells left free
+            # (and to store their positions as they are placed)
+            occupancy = OccupancyMap(self.b_size, self.cell_size)
+            placed = []
+            for w_color, pos, size in walls:
+                wall = Wall(w_color, pos, size)
+                occupancy.add(wall)
+                placed.append([w_color, list(wall.rect.topleft), list(wall.rect.size)])
+            levels.append(LevelData(
+                definition.attrib["id"],
+                color,
+                player_props,
+                number(mice, "count"),
+                number(mice, "finish"),
+                placed,
+                occupancy.free
+            ))
+        return levels
+
+    def to_bytes(self, key, levels):
+        """ Encodes compiled levels in the binary cache format.
+        key --      (bytes) The key of the compiled levels, see get_key
+        levels --   (list) The levels, as LevelData
+        returns --  (bytes)
+        """
+        out = bytearray(MAGIC)
+        out += HEADER.pack(VERSION, key, self.columns, self.rows, len(levels))
+        for level in levels:
+            id = level.id.encode()
+            out += struct.pack("<B", len(id)) + id
+            props = level.player_props
+            out += LEVEL.pack(
+                *level.color, len(level.walls), len(level.free),
+                props["pos"][0], props["pos"][1],
+                props["size"][0], props["size"][1],
+                props["speed"], props["accel"],
+                level.num_mice, level.mice_finish
+            )
+            for color, pos, size in level.walls:
+                out += WALL.pack(*color, pos[0], pos[1], size[0], size[1])
+            # store each free cell as its number, column by column
+            out += struct.pack(
+                "<{0}H".format(len(level.free)),
+                *[col * self.rows + row for col, row in level.free]
+            )
+        return bytes(out)
+
+    def from_bytes(self, data, key):
+        """ Decodes compiled levels in the binary cache format.
+        data --     (bytes) The encoded levels
+        key --      (bytes) The key the levels must have been compiled with
+        returns --  (list) The levels, as LevelData
+                    (None) If the levels weren't compiled with the key
+        """
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a compiled levels file")
+        pos = len(MAGIC)
+        version, cached_key, columns, rows, count = HEADER.unpack_from(data, pos)
+        if version != VERSION or cached_key != key:
+            return None
+        pos += HEADER.size
+        levels = []
+        for i in range(count):
+            length = data[pos]
+            id = data[pos+1:pos+1+length].decode()
+            pos += 1 + length
+            values = LEVEL.unpack_from(data, pos)
+            pos += LEVEL.size
+            num_walls, num_free = values[3], values[4]
+            player_props = {
+                "pos": [values[5], values[6]],
+                "size": [values[7], values[8]],
+                "speed": values[9],
+                "accel": values[10]
+            }
+            walls = []
+            for w in WALL.iter_unpack(data[pos:pos + num_walls*WALL.size]):
+                walls.append([tuple(w[0:3]), [w[3], w[4]], [w[5], w[6]]])
+            pos += num_walls * WALL.size
+            # leave the free cells encoded until the level is played
+            cells = data[pos:pos + 2*num_free]
+            pos += 2 * num_free
+            levels.append(LevelData(
+                id, tuple(values[0:3]), player_props, values[11], values[12],
+                walls, cells, rows
+            ))
+        return levels
+
+    def read_cache(self, key):
+        """ Reads the compiled levels from the cache.
+        key --      (bytes) The key the levels must have been compiled with
+        returns --  (list) The levels, as LevelData
+                    (None) If there are no cached levels for the key
+        """
+        try:
+            with open(self.cache_filename, 'rb') as file:
+                return self.from_bytes(file.read(), key)
+        except (OSError, ValueError, struct.error):
+            # a missing or broken cache is just compiled again
+            return None
+
+    def write_cache(self, key, levels):
+        """ Writes the compiled levels to the cache.
+        key --      (bytes) The key of the compiled levels, see get_key
+        levels --   (list) The levels, as LevelData
+        returns --  (None)
+        """
+        temp = self.cache_filename + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_filename), exist_ok=True)
+            with open(temp, 'wb') as file:
+                file.write(self.to_bytes(key, levels))
+            # replace the old cache only once the new one is written
+            os.replace(temp, self.cache_filename)
+        except OSError:
+            # the levels can still be played without a cache
+            # (e.g. if the data directory can't be written to)
+            pass
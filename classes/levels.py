@@ -1,108 +1,127 @@
 # import modules
 import pygame
-import random
 # import classes
 from .wall import Wall
 from .player import Player
-# Defines all levles in the game
+from .compact_player import CompactPlayer
+from .spatial_hash import SpatialHash
+from .occupancy_map import OccupancyMap
+# Defines the levels in the game
 class Level(object):
-    """ Base class for all levels. """
+    """ A level of the game, as defined in data/levels.xml (see LevelLoader).
+    """
+    
+    # Size of the cells used to index collideables
+    COLLIDE_CELL_SIZE = 50
+    # Size of mice, also the size of the cells mice are placed in
+    MOUSE_SIZE = 10
+    # The player used for each snake model, see Game
+    PLAYERS = {
+        "segments": Player,
+        "corners": CompactPlayer
+    }
     
-    def __init__(self, game, color=False, wall_color=False):
-        """ Constructor, create groups
+    def __init__(self, game, data):
+        """ Constructor
         game --     (object -- Game) A reference to the current game
-        color --    (list) Background color of level in RGB values
+        data --     (object -- LevelData) The compiled definition of the level
         returns --  (none)
         """
         # Set game
         self.game = game
+        self.data = data
         # Create easy reference to board size
         self.b_size = self.game.BOARD_SIZE
         # Calculate center of screen
         self.bcx = self.b_size[0]/2
         self.bcy = self.b_size[1]/2
-        # set colors
-        if color is False:
-            color = game.BLACK
-        self.color = color
-        if wall_color is False:
-            wall_color = game.BLUE
-        # set background image
+        # set color
+        self.color = data.color
+        # set background image, walls, and the indexes with only the walls
+        # in them (created when first loaded, see build)
         self.background = None
+        self.walls = None
+        self.wall_indexes = None
         # initialize level properties
-        self.num_mice = 0
-        self.player_props = {
-            "pos": [0, 0],
-            "size": [0, 0],
-            "speed": 0,
-            "accel": 0
-        }
-        self.mice_finish = 0
+        self.num_mice = data.num_mice
+        self.player_props = dict(data.player_props)
+        self.mice_finish = data.mice_finish
         # 10 mice in a bonus round per new life
         self.life_value = 10
         self.next_life = 0
-        # Create base walls
-        self.walls_list = [
-            [wall_color, [0, 0], [game.BOARD_SIZE[0], 20]],
-            [wall_color, [game.BOARD_SIZE[0]-20, 20], [20, game.BOARD_SIZE[1]-40]],
-            [wall_color, [0, game.BOARD_SIZE[1]-20], [game.BOARD_SIZE[0], 20]],
-            [wall_color, [0, 20], [20, game.BOARD_SIZE[1]-40]]
-        ]
+        # set walls [color, [x, y], [width, height]]
+        self.walls_list = data.walls
         
     def create_mouse (self):
+        """ Creates a mouse in a random cell that isn't covered by anything
+        else (player, wall, mouse).
+        returns --  (object -- Mouse) The new mouse
+                    (None) If the board is full and there is no room for a mouse
+        """
         from .mouse import Mouse
-        # funtion to generate random position for mouse
-        def position ():
-            return [
-                random.randrange(0, self.game.BOARD_SIZE[0]),
-                random.randrange(0, self.game.BOARD_SIZE[1])
-            ]
-        
-        # create position
-        pos = position()
-        mouse = Mouse (pos, [10, 10])
-        # move mouse until it doesn't collide with something else
-        # (player, wall, mouse)
-        hits = pygame.sprite.spritecollide(mouse, self.all_sprites, False)
-        while hits:
-            # generate new position
-            new_pos = position()
-            mouse.rect.x = new_pos[0]
-            mouse.rect.y = new_pos[1]
-            # look for collisions
-            hits = pygame.sprite.spritecollide(mouse, self.all_sprites, False)
+        # pick a random free cell
+        pos = self.occupancy.random_free(self.game.get_random("mice"))
+        # If there are no free cells, we can't create a mouse
+        if pos is None:
+            return None
+        mouse = Mouse (pos, [self.MOUSE_SIZE, self.MOUSE_SIZE])
         # mouse has been positioned, add to sprites
         self.mice.add(mouse)
-        self.all_sprites.add(mouse)
+        self.add_sprite(mouse)
+        return mouse
     
-    def load (self):
-        """ Loads resources and sprites for level.
+    def build (self):
+        """ Creates the parts of the level that don't change while it is
+        played (the walls, and the background they are drawn on),
+        the first time the level is loaded.
         returns --  (None)
         """
-        # create sprite groups
+        # index collideables by position for fast collision checks
+        self.collide_index = SpatialHash(self.COLLIDE_CELL_SIZE)
+        # track the cells covered by all sprites, for placing mice
+        # (the cells the walls leave free were found when compiled)
+        self.occupancy = OccupancyMap(
+            self.b_size, self.MOUSE_SIZE, self.data.free
+        )
+        # create walls
         self.walls = pygame.sprite.Group()
+        for w in self.walls_list:
+            # Use Wall to create standard platform
+            wall = Wall(w[0], w[1], w[2])
+            self.walls.add(wall)
+            self.collide_index.add(wall)
+            self.occupancy.add(wall)
+        # store the indexes with only the walls, to reset them to
+        self.wall_indexes = [
+            self.collide_index.snapshot(),
+            self.occupancy.snapshot()
+        ]
+        # walls never move, draw them on the background once
+        if not self.game.headless:
+            self.render_background()
+    
+    def load (self):
+        """ Loads the level to be played from the start. The level is built
+        the first time, and reset to its walls after that.
+        returns --  (None)
+        """
+        if self.walls is None:
+            self.build()
+        else:
+            # forget everything but the walls
+            self.collide_index.restore(self.wall_indexes[0])
+            self.occupancy.restore(self.wall_indexes[1])
+        # create sprite groups (the walls are always in the level)
         self.mice = pygame.sprite.Group()
-        self.collideables = pygame.sprite.Group()
-        self.all_sprites = pygame.sprite.Group()
-        # create player
-        self.player = Player(
+        self.collideables = pygame.sprite.Group(self.walls)
+        self.all_sprites = pygame.sprite.Group(self.walls)
+        # create player (which adds its segments to the level)
+        self.player = self.PLAYERS[self.game.snake_model](
             self.game,
             self.player_props["pos"],
             self.player_props["size"],
             self.player_props["speed"]
         )
-        # Add player segments to all sprites group
-        self.all_sprites.add(self.player.segments)
-        # create walls
-        for i in range(len(self.walls_list)):
-            # create wall
-            w = self.walls_list[i]
-            # Use Wall to create standard platform
-            wall = Wall(w[0], w[1], w[2])
-            # add to groups
-            self.walls.add(wall)
-            self.collideables.add(wall)
-            self.all_sprites.add(wall)
         # create mice
         for i in range(self.num_mice):
             self.create_mouse()
@@ -110,7 +129,80 @@ class Level(object):
         self.mice_count = 0
         self.next_life = 0
         self.complete = False
+        # nothing has been drawn yet
+        self.forget_drawn()
         
+    def add_sprite (self, sprite):
+        """ Adds a sprite to the level, so nothing else is placed over it.
+        sprite --   (object -- pygame.sprite.Sprite) The sprite to add
+        returns --  (None)
+        """
+        self.all_sprites.add(sprite)
+        self.occupancy.add(sprite)
+    
+    def remove_sprite (self, sprite):
+        """ Removes a sprite from the level.
+        sprite --   (object -- pygame.sprite.Sprite) The sprite to remove
+        returns --  (None)
+        """
+        self.all_sprites.remove(sprite)
+        self.occupancy.remove(sprite)
+    
+    def move_sprite (self, sprite):
+        """ Updates the cells a sprite covers after its rect has changed.
+        sprite --   (object -- pygame.sprite.Sprite) The sprite that changed
+        returns --  (None)
+        """
+        if sprite in self.occupancy:
+            self.occupancy.update(sprite)
+        if sprite in self.collide_index:
+            self.collide_index.update(sprite)
+    
+    def add_shape (self, shape, collideable=False):
+        """ Adds a shape that isn't a sprite (e.g. an Edge of a CompactPlayer)
+        to the level's indexes only, so nothing else is placed over it (and,
+        if collideable, so the player can collide with it).
+        Shapes are moved with move_sprite, like sprites.
+        shape --        (object) The shape to add, anything with a rect
+        collideable --  (bool) Whether the player can collide with the shape
+        returns --      (None)
+        """
+        self.occupancy.add(shape)
+        if collideable:
+            self.collide_index.add(shape)
+    
+    def remove_shape (self, shape):
+        """ Removes a shape added with add_shape from the level.
+        shape --    (object) The shape to remove
+        returns --  (None)
+        """
+        self.occupancy.remove(shape)
+        self.collide_index.remove(shape)
+    
+    def add_collideable (self, sprite):
+        """ Adds a sprite that the player can collide with.
+        sprite --   (object -- pygame.sprite.Sprite) The sprite to add
+        returns --  (None)
+        """
+        self.collideables.add(sprite)
+        self.collide_index.add(sprite)
+    
+    def remove_collideable (self, *sprites):
+        """ Removes sprites that the player can collide with.
+        sprites --  (object -- pygame.sprite.Sprite) The sprites to remove
+        returns --  (None)
+        """
+        for sprite in sprites:
+            self.collideables.remove(sprite)
+            self.collide_index.remove(sprite)
+    
+    def get_collisions (self, rect):
+        """ Gets the collideables that a rect collides with.
+        rect --     (object -- pygame.Rect) The rect to check
+        returns --  (list) The colliding sprites
+        """
+        return self.collide_index.query(rect)
+    
     def update(self):
         """ Update all of the sprites in this level """
         # update player
@@ -149,402 +241,72 @@ class Level(object):
         # Speed the player up
         self.player.change_velocity(num_mice * self.player_props["accel"])
     
-    def draw(self, screen, player=True):
+    def render_background(self):
+        """ Draws the background color and walls onto the background image.
+        returns --  (None)
+        """
+        self.background = pygame.Surface(self.b_size)
+        # If there is a display, match its pixel format for faster blits
+        if pygame.display.get_surface() is not None:
+            self.background = self.background.convert()
+        self.background.fill(self.color)
+        self.walls.draw(self.background)
+    
+    def draw(self, screen, player=True, alpha=1):
         """ Draw everything in this level
         screen --   (object -- pygame.Surface) The surface to draw the level on
         player --   (bool) Whether or not to draw the player (usually True)
+        alpha --    (float) How far (0 - 1) we are between logic ticks,
+                            see Player.draw
         returns --  (None)
         """
-        # Draw background
-        screen.fill(self.color)
+        # Draw background (and walls)
+        screen.blit(self.background, [0, 0])
         # Draw objects
         if player:
-            self.player.draw(screen)
+            self.player.draw(screen, alpha)
         self.mice.draw(screen)
-        self.walls.draw(screen)
-    
-    
-class Level_01(Level):
-    """ Level 01:
-        - Player:
-            - standard length
-            - at center
-            - speed of 240
-            - acceleration of 1.8
-        - 10 mice
-        - 75 mice to finish
-        - Base wall layout
-    """
-    
-    def __init__(self, game):
-        # Call parent constructor, color black
-        super().__init__(game, game.BLACK)
-        
-        # set player size, position, speed
-        self.player_props["size"] = [100, 10]
-        # calculate center of screen
-        cx = self.game.BOARD_SIZE[0]/2 - self.player_props["size"][0]/2
-        cy = self.game.BOARD_SIZE[1]/2 - self.player_props["size"][1]/2
-        self.player_props["pos"] = [cx, cy]
-        self.player_props["speed"] = 240
-        self.player_props["accel"] = 1.8
-        # set number of mice
-        self.num_mice = 10
-        # set number of mice required to finish
-        self.mice_finish = 75
-        # no extra walls for this level
-        
-
-class Level_02(Level):
-    """ Level 02:
-        - Player:
-            - standard length
-            - at center
-            - speed of 180
-            - acceleration of 3.0
-        - 10 mice
-        - 50 mice to finish
-        - Wall layout:
-            
-            ----    ---
-            |         |
-            
-            |         |
-            ---     ---
-    
-    """
-    
-    def __init__(self, game):
-        # Call parent constructor, color black
-        super().__init__(game, game.BLACK, game.FOREST)
-        
-        # set player size, position, speed
-        self.player_props["size"] = [100, 10]
-        # calculate center of screen
-        cx = self.game.BOARD_SIZE[0]/2 - self.player_props["size"][0]/2
-        cy = self.game.BOARD_SIZE[1]/2 - self.player_props["size"][1]/2
-        self.player_props["pos"] = [cx, cy]
-        self.player_props["speed"] = 180
-        self.player_props["accel"] = 3.0
-        # set number of mice
-        self.num_mice = 10
-        # set number of mice required to finish
-        self.mice_finish = 50
-        # define walls [color, [x, y], [width, height]]
-        self.walls_list.extend([
-            [game.FOREST, [100, 100],                    [200, 20]],
-            [game.FOREST, [100, 120],                    [20, 50]],
-            [game.FOREST, [100, game.BOARD_SIZE[1]-170], [20, 50]],
-            [game.FOREST, [100, game.BOARD_SIZE[1]-120], [200, 20]],
-            
-            [game.FOREST, [game.BOARD_SIZE[0]-300, 100], [200, 20]],
-            [game.FOREST, [game.BOARD_SIZE[0]-120, 120], [20, 50]],
-            [game.FOREST, [game.BOARD_SIZE[0]-120,
-                           game.BOARD_SIZE[1]-170],      [20, 50]],
-            [game.FOREST, [game.BOARD_SIZE[0]-300,
-                           game.BOARD_SIZE[1]-120],      [200,  20]]
-        ])
-
-
-class Level_03(Level):
-    """ Level 03:
-        - Player:
-            - long length
-            - below center
-            - speed of 300
-            - acceleration of 3.0
-        - 10 mice
-        - 40 mice to finish
-        - Wall layout:
-            
-            
-              -|-   -|-    
-            
-    
-    """
-    
-    def __init__(self, game):
-        # Call parent constructor, color black
-        super().__init__(game, game.BLACK, game.RED)
-        
-        # set player size, position, speed
-        self.player_props["size"] = [200, 10]
-        # calculate center of screen
-        cx = self.game.BOARD_SIZE[0]/2 - self.player_props["size"][0]/2
-        self.player_props["pos"] = [cx, self.game.BOARD_SIZE[1]-50]
-        self.player_props["speed"] = 300
-        self.player_props["accel"] = 3.0
-        # set number of mice
-        self.num_mice = 10
-        # set number of mice required to finish
-        self.mice_finish = 50
-        # define walls [color, [x, y], [width, height]]
-        self.walls_list.extend([
-            [game.RED, [125, 240],                    [150, 20]],
-            [game.RED, [190, 175],                    [20, 150]],
-            
-            [game.RED, [game.BOARD_SIZE[0]-255, 240], [150, 20]],
-            [game.RED, [game.BOARD_SIZE[0]-190, 175], [20, 150]]
-        ])
- 
-        
-class Level_04(Level):
-    """ Level 04:
-        - Player:
-            - standard length
-            - left center
-            - speed of 300
-            - acceleration of 1.8
-        - 15 mice
-        - 60 mice to finish
-        - Wall layout:
-                    
-                |    
-                |     
-                |       
-    
-    """
-    
-    def __init__(self, game):
-        # Call parent constructor, color black
-        super().__init__(game, game.BLACK, game.YELLOW)
-        
-        # set player size, position, speed
-        self.player_props["size"] = [100, 10]
-        # calculate center of screen
-        bcx = self.b_size[0]/2
-        cx = bcx - self.player_props["size"][0] - 30
-        cy = self.b_size[1]/2 - self.player_props["size"][1]/2
-        self.player_props["pos"] = [cx, cy]
-        self.player_props["speed"] = 300
-        self.player_props["accel"] = 1.8
-        # set number of mice
-        self.num_mice = 15
-        # set number of mice required to finish
-        self.mice_finish = 60
-        # define walls [color, [x, y], [width, height]]
-        self.walls_list.extend([
-            [game.YELLOW, [bcx-10, 50], [20, self.b_size[1]-100]]
-        ])
-
-
-class Level_05(Level):
-    """ Level 05:
-        - Player:
-            - standard length
-            - center
-            - speed of 180
-            - acceleration of 1.2
-        - 15 mice
-        - 55 mice to finish
-        - Wall layout:
-                    
-            ---------    
-                     
-            ---------       
-    
-    """
     
-    def __init__(self, game):
-        # set wall color
-        # Call parent constructor, color black
-        super().__init__(game, game.BLACK, game.FOREST)
-        
-        # set player size, position, speed
-        self.player_props["size"] = [100, 10]
-        # calculate center of screen
-        bcx = self.b_size[0]/2
-        bcy = self.b_size[1]/2
-        # calculate player position off of screen center
-        cx = bcx - self.player_props["size"][0]/2
-        cy = bcy - self.player_props["size"][1]/2
-        self.player_props["pos"] = [cx, cy]
-        self.player_props["speed"] = 180
-        self.player_props["accel"] = 1.2
-        # set number of mice
-        self.num_mice = 15
-        # set number of mice required to finish
-        self.mice_finish = 55
-        # define walls [color, [x, y], [width, height]]
-        self.walls_list.extend([
-            [game.MAROON, [50, bcy-95], [self.b_size[0]-100, 20]],
-            [game.MAROON, [50, bcy+75], [self.b_size[0]-100, 20]]
-        ])
-
-
-class Level_06(Level):
-    """ Level 06:
-        - Player:
-            - long length
-            - below center
-            - speed of 180
-            - acceleration of 3.6
-        - 10 mice
-        - 65 mice to finish
-        - Wall layout:
-                    
-            ---------    
-               ---         
-            ---------       
-    
-    """
-    
-    def __init__(self, game):
-        # set wall color
-        # Call parent constructor, color black
-        super().__init__(game, game.BLACK, game.BLUE)
-        
-        # set player size, position, speed
-        self.player_props["size"] = [200, 10]
-        # calculate player position off of screen center
-        cx = self.bcx - self.player_props["size"][0]/2
-        self.player_props["pos"] = [cx, self.b_size[1]-50]
-        self.player_props["speed"] = 180
-        self.player_props["accel"] = 3.6
-        # set number of mice
-        self.num_mice = 10
-        # set number of mice required to finish
-        self.mice_finish = 65
-        # define walls [color, [x, y], [width, height]]
-        self.walls_list.extend([
-            [game.YELLOW, [100, self.bcy-95], [self.b_size[0]-200, 20]],
-            [game.BLUE,   [250, self.bcy-10], [self.b_size[0]-500, 20]],
-            [game.YELLOW, [100, self.bcy+75], [self.b_size[0]-200, 20]]
-        ])
-
-
-class Level_07(Level):
-    """ Level 07:
-        - Player:
-            - short length
-            - center
-            - speed of 240
-            - acceleration of 3.6
-        - 10 mice
-        - 70 mice to finish
-        - Wall layout:
-            
-              ---    
-            |     |    
-              ---
-    
-    """
-    
-    def __init__(self, game):
-        # Call parent constructor, color black
-        super().__init__(game, game.NAVY, game.FOREST)
-        
-        # set player size, position, speed
-        self.player_props["size"] = [40, 10]
-        # calculate center of screen
-        cx = self.bcx - self.player_props["size"][0]/2
-        cy = self.bcy - self.player_props["size"][1]/2
-        self.player_props["pos"] = [cx, cy]
-        self.player_props["speed"] = 240
-        self.player_props["accel"] = 3.6
-        # set number of mice
-        self.num_mice = 10
-        # set number of mice required to finish
-        self.mice_finish = 70
-        # define walls [color, [x, y], [width, height]]
-        self.walls_list.extend([
-            [game.WHITE, [self.bcx-100, self.bcy-170], [200, 20]],
-            [game.WHITE, [self.bcx+150, self.bcy-100], [20, 200]],
-            [game.WHITE, [self.bcx-100, self.bcy+150], [200, 20]],
-            [game.WHITE, [self.bcx-170, self.bcy-100], [20, 200]]
-        ])
-
-
-class Level_08(Level):
-    """ Level 08:
-        - Player:
-            - standard length
-            - bottom right corner
-            - speed of 360
-            - acceleration of 6.0
-        - 10 mice
-        - 30 mice to finish
-        - Wall layout:
-            
-                |    
-            ---   ---    
-                |
-    
-    """
-    
-    def __init__(self, game):
-        # Call parent constructor, color black
-        super().__init__(game, game.NAVY, game.FOREST)
-        
-        # set player size, position, speed
-        self.player_props["size"] = [100, 10]
-        # place at bottom left corner
-        px = self.b_size[0] - self.player_props["size"][0] - 30
-        py = self.b_size[1] - self.player_props["size"][1] - 20
-        self.player_props["pos"] = [px, py]
-        self.player_props["speed"] = 360
-        self.player_props["accel"] = 6.0
-        # set number of mice
-        self.num_mice = 10
-        # set number of mice required to finish
-        self.mice_finish = 30
-        # define walls [color, [x, y], [width, height]]
-        c = game.FOREST
-        vl = (self.b_size[1]-220) // 2
-        hl = (self.b_size[0]-220) // 2
-        self.walls_list.extend([
-            [c, [self.bcx-10, 0],            [20, vl]],
-            [c, [self.bcx+110, self.bcy-10], [hl, 20]],
-            [c, [self.bcx-10, self.bcy+110], [20, vl]],
-            [c, [0, self.bcy-10],            [hl, 20]]
-        ])
-
-
-class Level_09(Level):
-    """ Level 09:
-        - Player:
-            - standard length
-            - center
-            - speed of 240
-            - acceleration of 2.4
-        - 15 mice
-        - 75 mice to finish
-        - Wall layout:
-            
-            __  __  __      
-           |          |
-           |__  __  __|   
-    
-    """
+    def forget_drawn(self):
+        """ Forgets what draw_dirty last drew,
+        so the next call to draw_dirty redraws everything.
+        returns --  (None)
+        """
+        self.drawn = None
     
-    def __init__(self, game):
-        # Call parent constructor, color black
-        super().__init__(game, game.NAVY, game.MAROON)
-        
-        # set player size, position, speed
-        self.player_props["size"] = [100, 10]
-        # place at center
-        px = self.bcx - self.player_props["size"][0]/2
-        py = self.bcy - self.player_props["size"][1]/2
-        self.player_props["pos"] = [px, py]
-        self.player_props["speed"] = 240
-        self.player_props["accel"] = 2.4
-        # set number of mice
-        self.num_mice = 15
-        # set number of mice required to finish
-        self.mice_finish = 75
-        # define walls [color, [x, y], [width, height]]
-        c = game.MAROON
-        # use loops to create walls
-        walls = []
-        for i in range(6):
-            a = i*100
-            walls.append(    [c, [self.bcx-275+a, 75],                [50, 20]])
-            walls.append(    [c, [self.bcx-275+a, self.b_size[1]-95], [50, 20]])
-            # only four of these
-            if i < 4:
-                walls.append([c, [75, self.bcy-175+a],                [20, 50]])
-                walls.append([c, [self.b_size[0]-95, self.bcy-175+a], [20, 50]])
-        self.walls_list.extend(walls)
-        
-        
\ No newline at end of file
+    def draw_dirty(self, screen, alpha=1):
+        """ Draws only the parts of this level that changed since the last
+        call, on a surface that still has the last call's drawing on it.
+        screen --   (object -- pygame.Surface) The surface to draw the level on
+        alpha --    (float) How far (0 - 1) we are between logic ticks,
+                            see Player.draw
+        returns --  (list) The pygame.Rects of the surface that changed
+        """
+        # get everything that moves, as it should be drawn now
+        rects = self.player.get_draw_rects(alpha)
+        for mouse in self.mice:
+            rects.append([mouse.color, mouse.rect])
+        # store each as hashable (color, (x, y, w, h))
+        drawn = set(
+            (tuple(color), tuple(rect)) for color, rect in rects
+            if rect.width > 0 and rect.height > 0
+        )
+        # If we don't know what was drawn before
+        if self.drawn is None:
+            # draw everything
+            self.drawn = drawn
+            self.draw(screen, alpha=alpha)
+            return [screen.get_rect()]
+        # Whatever was drawn before and isn't now needs to be erased,
+        # whatever wasn't drawn before and is now needs to be drawn
+        dirty = [pygame.Rect(r) for c, r in self.drawn.symmetric_difference(drawn)]
+        self.drawn = drawn
+        # Redraw each dirty area, clipped so nothing outside it changes
+        for area in dirty:
+            screen.set_clip(area)
+            screen.blit(self.background, area, area)
+            for color, rect in rects:
+                if area.colliderect(rect):
+                    screen.fill(color, rect)
+        screen.set_clip(None)
+        return dirty
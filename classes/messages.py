@@ -1,17 +1,54 @@
 # import modules
 import pygame
+from collections import OrderedDict
 from .text import Text
+from .font_cache import FontCache
 # create class
 class Messages (object):
     """ Class for creating in-game messages. """
     
+    # Max number of rendered texts to keep cached
+    max_rendered = 64
+    
     def __init__(self, game):
         # store the game
         self.game = game
-        # create default font
-        self.font = pygame.font.SysFont("serif", 25)
-        # Load the text for the game
-        Text.load(game.cwd+'/')
+        # find system fonts from the files found in earlier runs
+        self.font_cache = FontCache(game.cwd+'/')
+        # the default font is created when first used
+        self.font = None
+        # cache custom fonts by face, size, bold, italic
+        self.fonts = {}
+        # cache rendered text by text, color, font (least recently used first)
+        self.rendered = OrderedDict()
+        # Load the text for the game from our directory (when first used)
+        Text.set_directory(game.cwd+'/')
+    
+    def get_font (self, font=False):
+        """ Gets a PyGame font, only creating each font once.
+        font --     (list)  The typeface, size of the font, see render_text
+        returns --  (object -- pygame.font.Font)
+        """
+        # If we didn't receive a custom font, use default font
+        if not font:
+            # create the default font the first time it's used
+            if self.font is None:
+                self.font = self.font_cache.get_font("serif", 25)
+            return self.font
+        # default bold and italic
+        b = i = False
+        # if we received a third argument
+        if len(font) > 2:
+            b = font[2]
+        # if we received a fourth argument
+        if len(font) > 3:
+            i = font[3]
+        key = (font[0], font[1], b, i)
+        # If we haven't created this font yet
+        if key not in self.fonts:
+            # create custom font
+            self.fonts[key] = self.font_cache.get_font(font[0], font[1], b, i)
+        return self.fonts[key]
     
     def render_text (self, txt, color, font=False):
         """ Creates a PyGame surface with the text rendered on it
@@ -21,22 +58,16 @@ class Messages (object):
                             May contain optional third, and fourth items
                             specifying bold, italic as boolean flags
         returns --  (object -- pygame.Surface) A surface with the rendered text
+                    The surface is cached and shared, it must not be modified
         """
-        # if we received a custom font
-        if font:
-            # default bold and italic
-            b = i = False
-            # if we received a third argument
-            if len(font) > 2:
-                b = font[2]
-            # if we received a fourth argument
-            if len(font) > 3:
-                i = font[3]
-            # create custom font
-            font = pygame.font.SysFont(font[0], font[1], b, i)
-        else:
-            # use default font
-            font = self.font
+        # If we have already rendered this text
+        key = (txt, tuple(color), tuple(font) if font else None)
+        if key in self.rendered:
+            # mark as most recently used
+            self.rendered.move_to_end(key)
+            return self.rendered[key]
+        # get font
+        font = self.get_font(font)
         # if we received a string id in our text
         if 'STRID|' in txt:
             # if our entire text is a string id
@@ -59,6 +90,10 @@ class Messages (object):
                         txt = txt.replace(txt[start:start+7], '', 1)
         # render the text
         rendered = font.render(txt, True, color)
+        # cache the text, forget the least recently used if we have too many
+        self.rendered[key] = rendered
+        if len(self.rendered) > self.max_rendered:
+            self.rendered.popitem(last=False)
         return rendered
 
     def center (self, msg, size, center_x=True, center_y=True):
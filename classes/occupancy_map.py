@@ -0,0 +1,81 @@
+# import classes
+from .spatial_hash import SpatialHash
+# define class
+class OccupancyMap(SpatialHash):
+    """ Tracks which cells of a board are covered by sprites and which are
+    free, so a free position can be picked directly instead of guessing.
+    Inherits -- SpatialHash
+    """
+    
+    def __init__(self, size, cell_size, free=False):
+        """ Constructor
+        size --         (list -- int) The width, height of the board
+        cell_size --    (int) The width and height of each cell in pixels
+        free --         (list) (optional) The free cells, in order, if
+                               not every cell is free (e.g. the cells left
+                               free by sprites that are about to be added)
+        """
+        # call parent constructor
+        super().__init__(cell_size)
+        # store the number of columns and rows on the board
+        self.columns = size[0] // cell_size
+        self.rows = size[1] // cell_size
+        # store the free cells, and where each is in the list
+        if free is False:
+            free = [
+                (col, row)
+                for col in range(self.columns) for row in range(self.rows)
+            ]
+        self.free = list(free)
+        self.free_index = {cell: i for i, cell in enumerate(self.free)}
+    
+    def snapshot(self):
+        # copy the free cells (in order) too
+        return super().snapshot() + [list(self.free), dict(self.free_index)]
+    
+    def restore(self, snapshot):
+        super().restore(snapshot)
+        self.free = list(snapshot[2])
+        self.free_index = dict(snapshot[3])
+    
+    def _add_to_cell(self, cell, sprite):
+        # If the cell was empty, it isn't free anymore
+        if cell not in self.cells and cell in self.free_index:
+            # swap the last free cell into this cell's place
+            i = self.free_index.pop(cell)
+            last = self.free.pop()
+            if last != cell:
+                self.free[i] = last
+                self.free_index[last] = i
+        super()._add_to_cell(cell, sprite)
+    
+    def _remove_from_cell(self, cell, sprite):
+        super()._remove_from_cell(cell, sprite)
+        # If the cell is now empty (and on the board), it is free
+        if cell not in self.cells and self.is_on_board(cell):
+            self.free_index[cell] = len(self.free)
+            self.free.append(cell)
+    
+    def is_on_board(self, cell):
+        """ Checks if a cell is within the board.
+        cell --     (tuple) The column, row of the cell
+        returns --  (bool)
+        """
+        return 0 <= cell[0] < self.columns and 0 <= cell[1] < self.rows
+    
+    def is_full(self):
+        """ Checks if every cell of the board is covered.
+        returns --  (bool)
+        """
+        return not self.free
+    
+    def random_free(self, rng):
+        """ Picks a random free cell.
+        rng --      (object -- random.Random) The random number generator to use
+        returns --  (list -- int) The x, y coordinates of the cell's top left
+                    (None) If there are no free cells
+        """
+        if not self.free:
+            return None
+        cell = self.free[rng.randrange(len(self.free))]
+        return [cell[0] * self.cell_size, cell[1] * self.cell_size]
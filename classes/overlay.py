@@ -0,0 +1,148 @@
+# import modules
+import pygame
+import time
+# define class
+class Overlay(object):
+    """ Shows how the game is performing (e.g. FPS, logic and render times)
+    over the board. The overlay times the game itself, and only redraws
+    its text a few times a second, from glyphs rendered once, so it costs
+    very little to show.
+    """
+
+    # Define the font and color of the text
+    FONT = ["monospace", 14, True]
+    COLOR = (0xFF, 0xFF, 0x00)
+    # Define the size and position (on the board) of the overlay
+    SIZE = (220, 110)
+    POSITION = (25, 25)
+    PADDING = 5
+    # Define how often (in seconds) the numbers shown are updated
+    REFRESH = 0.25
+
+    def __init__(self, game):
+        """ Constructor
+        game --     (object -- Game) The game to show the performance of
+        """
+        self.game = game
+        self.visible = False
+        # store the glyph of each character, rendered when first needed
+        self.glyphs = {}
+        self.font = None
+        # create the surface the text is drawn on, when first shown
+        self.surface = None
+        # the rect of the board the overlay was last drawn over (if any)
+        self.rect = None
+        self.reset()
+
+    def reset (self):
+        """ Starts timing again from now.
+        returns --  (None)
+        """
+        # store when each timer started, and their totals since the refresh
+        self.started = {}
+        self.totals = {"logic": 0.0, "render": 0.0}
+        self.frames = 0
+        self.refreshed = time.perf_counter()
+        # the lines of text shown (nothing is known yet)
+        self.lines = ["FPS: -"]
+        self.changed = True
+
+    def toggle (self):
+        """ Shows the overlay if hidden, hides it if shown.
+        returns --  (None)
+        """
+        self.visible = not self.visible
+        self.reset()
+
+    def start (self, name):
+        """ Starts a timer, when the overlay is shown.
+        name --     (str) The timer, "logic" or "render"
+        returns --  (None)
+        """
+        if self.visible:
+            self.started[name] = time.perf_counter()
+
+    def stop (self, name):
+        """ Stops a timer, adding the time since it started to its total.
+        name --     (str) The timer, "logic" or "render"
+        returns --  (None)
+        """
+        start = self.started.pop(name, None)
+        if start is not None:
+            self.totals[name] += time.perf_counter() - start
+
+    def end_frame (self):
+        """ Counts a frame, updating the numbers shown when it's time to.
+        returns --  (None)
+        """
+        if not self.visible:
+            return
+        self.frames += 1
+        now = time.perf_counter()
+        elapsed = now - self.refreshed
+        if elapsed < self.REFRESH:
+            return
+        level = self.game.get_level()
+        # average the timers over the frames since the last refresh
+        self.lines = [
+            "FPS: {0:.1f}".format(self.frames / elapsed),
+            "logic: {0:.2f} ms".format(self.totals["logic"] / self.frames * 1000),
+            "render: {0:.2f} ms".format(self.totals["render"] / self.frames * 1000),
+            "collideables: {0}".format(len(level.collide_index)),
+            "sprites: {0}".format(len(level.all_sprites)),
+            "mouse cells free: {0}".format(len(level.occupancy.free))
+        ]
+        self.changed = True
+        self.totals = {"logic": 0.0, "render": 0.0}
+        self.frames = 0
+        self.refreshed = now
+
+    def get_glyph (self, char):
+        """ Gets the rendered glyph of a character, rendering it only once.
+        char --     (str) The character
+        returns --  (object -- pygame.Surface)
+        """
+        if char not in self.glyphs:
+            self.glyphs[char] = self.font.render(char, True, self.COLOR)
+        return self.glyphs[char]
+
+    def _render (self):
+        """ Redraws the lines of text on our surface, glyph by glyph.
+        returns --  (None)
+        """
+        if self.surface is None:
+            self.font = self.game.messages.get_font(self.FONT)
+            self.surface = pygame.Surface(self.SIZE)
+            self.surface.set_alpha(200)
+        self.surface.fill(self.game.BLACK)
+        y = self.PADDING
+        for line in self.lines:
+            x = self.PADDING
+            for char in line:
+                glyph = self.get_glyph(char)
+                self.surface.blit(glyph, [x, y])
+                x += glyph.get_width()
+            y += self.font.get_linesize()
+        self.changed = False
+
+    def draw (self, screen, board, board_pos):
+        """ Draws the overlay over the board on the screen. If the overlay
+        was hidden since it was drawn, the board under it is drawn instead.
+        screen --       (object -- pygame.Surface) The screen
+        board --        (object -- pygame.Surface) The board, as drawn
+        board_pos --    (list) The position of the board on the screen
+        returns --      (list) The rects of the screen that were drawn over
+        """
+        rects = []
+        # If we were drawn, uncover what we were drawn over
+        if self.rect is not None:
+            rects.append(
+                screen.blit(board, self.rect.move(board_pos), self.rect)
+            )
+            self.rect = None
+        if self.visible:
+            if self.changed:
+                self._render()
+            self.rect = pygame.Rect(self.POSITION, self.SIZE)
+            rects.append(screen.blit(self.surface, self.rect.move(board_pos)))
+        return rects
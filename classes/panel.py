@@ -6,89 +6,163 @@ from .messages import Text
 # define class
 class Panel(pygame.Surface):
     """ Represents an instance of the game panel.
+    The panel keeps what it last drew, and only redraws the parts
+    of itself whose values have changed.
     Inherits -- PyGame Surface class
     """
     
+    # Define the size of the level progress info
+    PROGRESS_SIZE = (500, 20)
+    PROGRESS_BAR_WIDTH = 425
+    BORDER_HEIGHT = 5
+    # Define default padding
+    PADDING = 20
+    
     def __init__(self, game):
         # run parent surface constructor
         super().__init__(game.PANEL_SIZE)
         
         # set the game reference
         self.game = game
+        # create the surfaces for the level progress info once, to be reused
+        self.progress = pygame.Surface(self.PROGRESS_SIZE)
+        self.prog_bar = pygame.Surface(
+            [self.PROGRESS_BAR_WIDTH, self.PROGRESS_SIZE[1]]
+        )
+        self.border = pygame.Surface([game.PANEL_SIZE[0], self.BORDER_HEIGHT])
+        # store the values each part of the panel was last drawn with
+        self.values = {}
+        # store each drawn part of the panel as [surface, position]
+        self.parts = {}
     
-    def draw (self, panel=False):
-        """ Draws the game panel to display relevant info.
-        panel --   (object -- pygame.Surface)   A surface to draw the panel on
-                                                defaults to self
+    def invalidate (self):
+        """ Forgets what was drawn, so the whole panel is redrawn next time.
         returns -- (None)
         """
-        # If we didn't receive an alternate panel surface
-        if not panel:
-            # then use our own surface
-            panel = self
+        self.values = {}
+    
+    def _changed (self, name, value):
+        """ Checks if a part of the panel needs to be redrawn,
+        and stores the value it will be drawn with.
+        name --    (str) The name of the part
+        value --   (mixed) The value the part displays
+        returns -- (bool) Whether the value is different from the last drawn
+        """
+        if name in self.values and self.values[name] == value:
+            return False
+        self.values[name] = value
+        return True
+    
+    def update (self):
+        """ Redraws the parts of the panel whose values have changed.
+        returns -- (bool) Whether anything changed
+        """
         # reference size for easy refernce
         size = self.game.PANEL_SIZE
         # get reference to level and messages
         level = self.game.get_level()
         msgs = self.game.messages
-        # create default padding
-        pad = 20
+        # copy default padding
+        pad = self.PADDING
         # copy font color
         txt_color = self.game.colors["panel_text"]
         # create arial font
         arial = ["Arial", 16, True]
-        # fill panel
-        panel.fill(self.game.colors["panel"])
-        # create score
-        scr = msgs.render_text(
-            "{{STRID|info001score}}: {0}".format(self.game.score), txt_color
-        )
-        # horizontally center score
-        scr_cx = msgs.center(scr, size, True, False)
-        # copy to panel, centered top
-        panel.blit(scr, [scr_cx, 10])
-        # create level
-        lvl = msgs.render_text(
-            "{{STRID|info006level}}: {0}".format(self.game.current_level+1),
-            txt_color,
-            arial
-        )
-        # copy to panel, top right corner
-        panel.blit(lvl, [25, 15])
-        # create lives
-        liv = msgs.render_text(
-            "{{STRID|info005lives}}: {0}".format(self.game.lives),
-            txt_color,
-            arial
-        )
-        # copy to panel, top right corner
-        panel.blit(liv, [size[0]-liv.get_width()-25, 15])
-        # create surface to store level progress info
-        progress_height = 20
-        progress = pygame.Surface([500, progress_height])
-        progress.fill(self.game.colors["panel"])
         # get number of mice, and mice needed to complete level
         num_mice = level.mice_count
         req_mice = level.mice_finish
-        # Create progress bar
-        prog_width = 425
-        prog_bar = pygame.Surface([prog_width, progress_height])
+        changed = False
+        # If the score changed
+        if self._changed("score", self.game.score):
+            changed = True
+            # create score
+            scr = msgs.render_text(
+                "{{STRID|info001score}}: {0}".format(self.game.score), txt_color
+            )
+            # horizontally center score
+            scr_cx = msgs.center(scr, size, True, False)
+            # centered top
+            self.parts["score"] = [scr, [scr_cx, 10]]
+        # If the level changed
+        if self._changed("level", self.game.current_level):
+            changed = True
+            # create level
+            lvl = msgs.render_text(
+                "{{STRID|info006level}}: {0}".format(self.game.current_level+1),
+                txt_color,
+                arial
+            )
+            # top right corner
+            self.parts["level"] = [lvl, [25, 15]]
+        # If the lives changed
+        if self._changed("lives", self.game.lives):
+            changed = True
+            # create lives
+            liv = msgs.render_text(
+                "{{STRID|info005lives}}: {0}".format(self.game.lives),
+                txt_color,
+                arial
+            )
+            # top right corner
+            self.parts["lives"] = [liv, [size[0]-liv.get_width()-25, 15]]
+        # If the level progress changed
+        if self._changed("progress", (num_mice, req_mice, level.complete)):
+            changed = True
+            self._draw_progress(num_mice, req_mice, level.complete, arial)
+            # bottom left corner
+            self.parts["progress"] = [
+                self.progress,
+                [pad, size[1]-self.PROGRESS_SIZE[1]-pad]
+            ]
+        # If bonus mode changed
+        if self._changed("bonus", level.complete):
+            changed = True
+            # if the level is complete
+            if level.complete:
+                # create bonus mode
+                bonus = msgs.render_text(
+                    "STRID|info004bonus", self.game.RED, arial
+                )
+                # bottom right corner
+                self.parts["bonus"] = [
+                    bonus,
+                    [
+                        size[0] - bonus.get_width() - pad,
+                        size[1] - bonus.get_height() - pad
+                    ]
+                ]
+            else:
+                self.parts["bonus"] = None
+        return changed
+    
+    def _draw_progress (self, num_mice, req_mice, complete, font):
+        """ Redraws the level progress info (progress bar and mice count).
+        num_mice -- (int) The number of mice eaten
+        req_mice -- (int) The number of mice needed to complete the level
+        complete -- (bool) Whether the level is complete
+        font --     (list) The font to use, see Messages.render_text
+        returns --  (None)
+        """
+        msgs = self.game.messages
+        progress = self.progress
+        prog_bar = self.prog_bar
+        prog_width = self.PROGRESS_BAR_WIDTH
+        progress.fill(self.game.colors["panel"])
         # If the level is NOT complete
-        if not level.complete:
+        if not complete:
             # progress bar is not full, color grey
             prog_bar.fill(self.game.GREY)
-            # Create yellow bar to show our progress so far
+            # Fill yellow bar to show our progress so far
             # width is percentage of progress bar based on num_mice and req_mice
             percent_width = math.ceil(prog_width * (num_mice/req_mice))
-            percent_bar = pygame.Surface([percent_width, progress_height])
-            percent_bar.fill(self.game.YELLOW)
-            # blit percent bar on top of empty progress bar
-            prog_bar.blit(percent_bar, [0, 0])
+            prog_bar.fill(
+                self.game.YELLOW, [0, 0, percent_width, self.PROGRESS_SIZE[1]]
+            )
         else:
             # level is complete, progress bar is full, color green
             prog_bar.fill(self.game.GREEN)
             # create level complete
-            lvl_font = list(arial)
+            lvl_font = list(font)
             lvl_font[1] = 18
             lvl_comp = msgs.render_text(
                 "STRID|info003complete", self.game.BLACK, lvl_font
@@ -104,26 +178,34 @@ class Panel(pygame.Surface):
         # Create mice count
         mce = msgs.render_text(
             "{0}/{1} {{STRID|info002mice}}".format(num_mice, req_mice),
-            txt_color,
-            arial
+            self.game.colors["panel_text"],
+            font
         )
         # output mice to progress
         progress.blit(mce, [prog_width+10, 2])
-        # output progress to panel, bottom left corner
-        panel.blit(progress, [pad, size[1]-progress_height-pad])
-        # if the level is complete
-        if level.complete:
-            # create bonus mode
-            bonus = msgs.render_text("STRID|info004bonus", self.game.RED, arial)
-            # output bonus to panel, bottom right corner
-            panel.blit(
-                bonus,
-                [
-                    size[0] - bonus.get_width() - pad,
-                    size[1] - bonus.get_height() - pad
-                ]
-            )
+    
+    def draw (self, panel=False):
+        """ Draws the game panel to display relevant info.
+        panel --   (object -- pygame.Surface)   A surface to draw the panel on
+                                                defaults to self
+        returns -- (bool) Whether anything was drawn, when drawing on ourself
+                          nothing is drawn if nothing has changed
+        """
+        # Redraw any parts that have changed
+        changed = self.update()
+        # If we didn't receive an alternate panel surface
+        if not panel:
+            # If nothing changed, we already show the right thing
+            if not changed:
+                return False
+            # then use our own surface
+            panel = self
+        # fill panel
+        panel.fill(self.game.colors["panel"])
+        # output each part to panel
+        for name in ["score", "level", "lives", "progress", "bonus"]:
+            if self.parts[name] is not None:
+                panel.blit(self.parts[name][0], self.parts[name][1])
         # output bottom border to panel
-        border = pygame.Surface([size[0], 5])
-        panel.blit(border, [0, size[1]-5])
-    
\ No newline at end of file
+        panel.blit(self.border, [0, self.game.PANEL_SIZE[1]-self.BORDER_HEIGHT])
+        return True
@@ -1,5 +1,6 @@
 # pygame module requried
 import pygame
+from collections import deque
 #import classes
 from .segment import Segment 
 # define class
@@ -10,6 +11,15 @@ class Player(object):
     
     # How much we grow
     GROW_LENGTH = 20
+    # How many turns can wait to be made
+    MAX_TURNS = 3
+    # Define the opposite of each direction
+    OPPOSITES = {
+        "up": "down",
+        "down": "up",
+        "left": "right",
+        "right": "left"
+    }
     
     def __init__(self, game, position, size, velocity):
         """ Constructor
@@ -29,14 +39,29 @@ class Player(object):
             "pos": position,
             "length": size[0]
         }
-        # set velocity relative to framerate
-        self.velocity = velocity / game.fps
+        # set velocity relative to logic tick rate
+        self.velocity = velocity / game.tick_rate
+        # count the logic ticks we have been updated for
+        self.ticks = 0
+        # track how many ticks turns waited before being made
+        self.turn_latency = {
+            "last": 0,
+            "max": 0
+        }
         # create new player
         self._new(position, size[0])
         
     def resurrect (self):
         """ Removes the current player, and creates a new player at same speed."""
         #print ("resurrect")
+        # pause game
+        self.game.paused = True
+        # If we are running headless
+        if self.game.headless:
+            # there is nothing to draw, just reset player
+            self._remove_all()
+            self._new(self.start["pos"], self.start["length"])
+            return
         # draw level without player
         self.game.get_level().draw(self.game.board, False)
         # draw current player with transparent background
@@ -44,32 +69,66 @@ class Player(object):
         player.fill(self.game.BLACK)
         player.set_colorkey(self.game.BLACK)
         self.draw(player)
+        # function to reset the player once it has faded out
+        def reset():
+            #print ("finish fade out")
+            # remove player segments from level
+            self._remove_all()
+            # reset player
+            self._new(self.start["pos"], self.start["length"])
+            # draw level without player, and new player
+            self.game.get_level().draw(self.game.board, False)
+            player.fill(self.game.BLACK)
+            self.draw(player)
+            #print ("start fade in")
+            # fade in player
+            self.game.fade_in([player], [self.game.board])
         # fade out player
-        self.game.fade_out([player], [self.game.board])
-        #print ("finish fade out")
-        # remove player segments from collideables
-        self.game.get_level().collideables.remove(self.segments)
-        # reset player
-        self._new(self.start["pos"], self.start["length"])
-        # draw new player
-        player.fill(self.game.BLACK)
-        self.draw(player)
-        #print ("start fade in")
-        # fade in player
-        self.game.fade_in([player], [self.game.board])
-        # pause game
-        self.game.paused = True
+        self.game.fade_out([player], [self.game.board], on_done=reset)
         
     def _new (self, position, length):
         """ Performs operations involved in the creation of a new player."""
         # set direction
         self.direction = "left"
+        # set turns waiting to be made, as [direction, tick queued]
+        self.turns = deque()
+        # rects of the segments that moved, as they were before the last tick
+        self.prev_rects = {}
+        # create our body, as long as our thickness
+        self._new_body(position)
+        # set length
+        head = self.get_head()
+        head.add_length(length)
+        self.game.get_level().move_sprite(head)
+    
+    def _new_body (self, position):
+        """ Creates our body, a single segment, as long as our thickness.
+        position -- (list -- int) x, y coordinates of snake's top left corner
+        returns --  (None)
+        """
         # set segments
         self.segment_list = []
         self.segments = pygame.sprite.Group()
         self.create_segment(position)
-        # set length
-        self.segment_list[0].add_length(length)
+    
+    def get_head (self):
+        """ Gets the segment at our head.
+        returns --  (object -- Segment)
+        """
+        return self.segment_list[0]
+    
+    def get_tail (self):
+        """ Gets the segment at our tail.
+        returns --  (object -- Segment)
+        """
+        return self.segment_list[-1]
+    
+    def _remove_all (self):
+        """ Removes all of the player's segments from the level."""
+        level = self.game.get_level()
+        level.remove_collideable(*self.segments)
+        for seg in self.segments:
+            level.remove_sprite(seg)
     
     def create_segment(self, position=False):
         """ Creates a new snake segment and makes it the new head.
@@ -77,37 +136,6 @@ class Player(object):
         position --     (list -- int) x, y coordinates of snake's top left corner
         returns -- (none)
         """
-        # If there is more than one segment
-        if len(self.segment_list) > 1:
-            # If the second segment is
-            # running the opposite direction as this new segment
-            seg2 = self.segment_list[1]
-            seg1 = self.segment_list[0]
-            if      self.direction == "up" and seg2.direction == "down" or\
-                    self.direction == "down" and seg2.direction == "up" or\
-                    self.direction == "left" and seg2.direction == "right" or\
-                    self.direction == "right" and seg2.direction == "left":
-                #keep us heading in the previous direction for now
-                new_direct = self.direction
-                self.direction = seg1.direction
-                # Because we are going to be running parallel
-                # with the second segment, if we aren't at least one segment
-                # thickness away from the second segment, we will collide with
-                # the second segment. To prevent that, wait until our first
-                # segment is at least twice as long as our thickness.
-                # This runs an internal game loop for the duration of the loop.
-                while seg1.length <= (self.thickness * 2) + 1:
-                    # Don't listen for events while we are wating
-                    # (easy way to ignore turns)
-                    # Run logic
-                    self.game.run_logic()
-                    # Draw frame
-                    self.game.display_frame()
-                    # tick clock
-                    self.game.update_clock()
-                # now we can head our new direction
-                self.direction = new_direct
-                
         # if we were not given a position, set to arbitrary
         if not position:
             pos = [0, 0]
@@ -116,48 +144,23 @@ class Player(object):
         seg = Segment (self.game.GREEN, pos, self.thickness, self.direction)
         self.segment_list.insert(0, seg)
         self.segments.add(seg)
-        self.game.get_level().all_sprites.add(seg)
-        # add the thickness of the previous segment to our length
-        seg.add_length(self.thickness)
-        # if we weren't given a position, position now
-        if not position:
-            # get previous head
-            head = self.segment_list[1]
-            # use our direction (seg) and head's direciton to position ourselves
-            # we should evenly overlap the previous segment by our thickness
+        # If we were given a position, we are the first segment
+        if position:
+            # add our thickness to our length
+            seg.add_length(self.thickness)
+        else:
+            # position ourselves after the previous head,
+            # we should evenly overlap it by our thickness
             # -- (overlap at corner)
-            if head.direction == "up":
-                seg.rect.top = head.rect.top
-                if seg.direction == "left":
-                    seg.rect.right = head.rect.right
-                else:
-                    seg.rect.left = head.rect.left
-            if head.direction == "left":
-                if seg.direction == "up":
-                    seg.rect.bottom = head.rect.bottom
-                else:
-                    seg.rect.top = head.rect.top
-                seg.rect.left = head.rect.left
-            if head.direction == "down":
-                seg.rect.bottom = head.rect.bottom
-                if seg.direction == "left":
-                    seg.rect.right = head.rect.right
-                else:
-                    seg.rect.left = head.rect.left
-            if head.direction == "right":
-                if seg.direction == "up":
-                    seg.rect.bottom = head.rect.bottom
-                else:
-                    seg.rect.top = head.rect.top
-                seg.rect.right = head.rect.right
-            # Update the realPos of our segment
-            seg.update_realPos()
+            seg.place_after(self.segment_list[1], self.thickness)
+        # add to level, now that we are positioned
+        self.game.get_level().add_sprite(seg)
         
         # If there are more than two segments
         if len(self.segment_list) > 3:
             # make the third segment collideable
             # (first two player segments aren't collideable)
-            self.game.get_level().collideables.add(self.segment_list[3])
+            self.game.get_level().add_collideable(self.segment_list[3])
     
     def remove_segment (self):
         """ Removes the tail segment from the snake.
@@ -168,9 +171,9 @@ class Player(object):
         # If there are more than three segments
         if len(self.segment_list) > 3:
             # remove this from collideables
-            self.game.get_level().collideables.remove(tail)
+            self.game.get_level().remove_collideable(tail)
         # Remove from all sprites
-        self.game.get_level().all_sprites.remove(tail)
+        self.game.get_level().remove_sprite(tail)
         self.segments.remove(tail)    
         # Delete segment
         del self.segment_list[-1]           
@@ -209,88 +212,37 @@ class Player(object):
         Handles collisions with mice.
         returns -- (none)
         """
+        # Make the next turn waiting, if it can be made now
+        self._apply_turn()
+        # Count this tick
+        self.ticks += 1
         # Get player vector
         vector = self.get_vector()
         # Get length change from combined vector (one should be zero)
         length = abs(vector["x"] + vector["y"])
-        # Move head segment
-        head = self.segment_list[0]
-        # If we have more than one segment
-        if len(self.segment_list) > 1:
-            # Lengthen head segment
-            head.add_length(length)
-        # Else, if we are headed down or right
-        elif head.direction in ["down", "right"]:
-            # Update head segment position
-            head.move_pos([vector["x"], vector["y"]])
-        # Update head segment position
-        if head.direction in ["up", "left"]:
-            head.move_pos([vector["x"], vector["y"]])
-        # If we have more than one segment
-        if len(self.segment_list) > 1:
-            # Shorten tail segment
-            while length > 0:
-                # Get last segment
-                tail = self.segment_list[-1]
-                # Subtract length, and get new length of segment
-                new_len = tail.add_length(-length)
-                # If the new length is less than or equal to our thickness
-                if new_len <= self.thickness:
-                    # Delete the segment
-                    self.remove_segment()
-                    # Update remaining length to remove from next segment
-                    length = abs(new_len - self.thickness)
-                else:
-                    # The segment still exists
-                    # Update tail segment position
-                    if tail.direction == "down":
-                        tail.move_pos([0, length])
-                    elif tail.direction == "right":
-                        tail.move_pos([length, 0])
-                    # there is no more length to remove
-                    length = 0
-        
+        # Move our head forward, and our tail after it
+        self._move(vector, length)
         # Use the front 10 pixels (thickness) of our head to detect collisions
-        # Calculate the position of the front of our head
-        # Start with the position of our head
-        front_pos = [head.rect.x, head.rect.y]
-        # If we are moving  right
-        if head.direction == "right":
-            # Add our length to our x position
-            front_pos[0] += (head.length-10)
-        # Else, if we are moving down
-        elif head.direction == "down":
-            # Add our length to our y position
-            front_pos[1] += (head.length-10)
-        # Create a sprite to represent our front
+        # (collisions only need a rect, so it doesn't get an image)
         front = pygame.sprite.Sprite()
-        # Make it a square the size of our thickness
-        front.image = pygame.Surface([self.thickness, self.thickness])
-        # Use our calculated position
-        front.rect = front.image.get_rect()
-        front.rect.x = front_pos[0]
-        front.rect.y = front_pos[1]
+        front.rect = self.get_front()
         # Check and see if we have collided with any mice (remove hit mice)
         mouse_hits = pygame.sprite.spritecollide(front, self.game.get_level().mice, True)
         # DEBUG
         # mouse_hits.append(1)
         # Loop through hit mice
         for m in mouse_hits:
+            # Remove mouse from the level
+            self.game.get_level().remove_sprite(m)
             # Count mice
             self.game.get_level().count_mice(1)
-            # Get last segment
-            tail = self.segment_list[-1]
-            # Add length to tail
-            tail.add_length(self.GROW_LENGTH)
-            # Update tail segment position
-            if tail.direction == "down":
-                tail.move_pos([0, -self.GROW_LENGTH])
-            elif tail.direction == "right":
-                tail.move_pos([-self.GROW_LENGTH, 0])
+            # Grow our tail
+            self.grow(self.GROW_LENGTH)
             # create new mouse
             self.game.get_level().create_mouse()
         # Check and see if our head has collided with a wall or ourselves
-        collisions = pygame.sprite.spritecollide(front, self.game.get_level().collideables, False)
+        # (only checks collideables in the grid cells around our front)
+        collisions = self.game.get_level().get_collisions(front.rect)
         # If we have
         if collisions:
             # If the level is complete
@@ -307,53 +259,197 @@ class Player(object):
                 # Whoops! Game over!
                 self.game.end()
             
-    def draw(self, screen):
+    def _move(self, vector, length):
+        """ Moves our head forward, and our tail after it, by lengthening
+        the head segment and shortening the tail segment.
+        vector --   (dict) The x, y we are moving by, see get_vector
+        length --   (float) The distance we are moving
+        returns --  (None)
+        """
+        # Move head segment
+        head = self.segment_list[0]
+        # Only the head and tail move, store where they were before this tick
+        tail = self.segment_list[-1]
+        self.prev_rects = {
+            head: head.rect.copy(),
+            tail: tail.rect.copy()
+        }
+        # If we have more than one segment
+        if len(self.segment_list) > 1:
+            # Lengthen head segment
+            head.grow_front([vector["x"], vector["y"]], length)
+        else:
+            # Update head segment position
+            head.move_pos([vector["x"], vector["y"]])
+        # head changed, update the cells it covers
+        self.game.get_level().move_sprite(head)
+        # If we have more than one segment
+        if len(self.segment_list) > 1:
+            # Shorten tail segment
+            while length > 0:
+                # Get last segment
+                tail = self.segment_list[-1]
+                # Subtract length, and get new length of segment
+                new_len = tail.shrink_back(length, self.thickness)
+                # If the new length is less than or equal to our thickness
+                if new_len <= self.thickness:
+                    # Delete the segment
+                    self.remove_segment()
+                    # Update remaining length to remove from next segment
+                    length = abs(new_len - self.thickness)
+                else:
+                    # The segment still exists,
+                    # tail changed size, update the cells it covers
+                    self.game.get_level().move_sprite(tail)
+                    # there is no more length to remove
+                    length = 0
+    
+    def get_front(self):
+        """ Gets the front of our head (the last thickness pixels of it),
+        used to detect collisions.
+        returns --  (object -- pygame.Rect)
+        """
+        return self.get_head().get_front(self.thickness)
+    
+    def grow(self, length):
+        """ Makes us longer, by lengthening our tail.
+        length --   (int) The length to add
+        returns --  (None)
+        """
+        # Add length to tail
+        tail = self.get_tail()
+        tail.grow_back(length)
+        # tail changed size, update the cells it covers
+        self.game.get_level().move_sprite(tail)
+    
+    def get_draw_rects(self, alpha=1):
+        """ Gets where each of the player's segments should be drawn.
+        Segments that moved in the last logic tick are drawn part way
+        between where they were before and after the tick.
+        alpha --    (float) How far (0 - 1) to draw moved segments from their
+                            previous position to their current position
+        returns --  (list) A [color, pygame.Rect] for each segment
+        """
+        rects = []
+        for seg in self.segment_list:
+            rect = seg.rect
+            # If this segment moved, and we are drawing between ticks
+            if alpha < 1 and seg in self.prev_rects:
+                # interpolate between the previous and current rect
+                rect = self.interpolate(self.prev_rects[seg], rect, alpha)
+            rects.append([seg.color, rect])
+        return rects
+    
+    def interpolate(self, prev, rect, alpha):
+        """ Gets a rect part way between where it was and where it is.
+        prev --     (object -- pygame.Rect) Where the rect was
+        rect --     (object -- pygame.Rect) Where the rect is
+        alpha --    (float) How far (0 - 1) from prev to rect
+        returns --  (object -- pygame.Rect)
+        """
+        return pygame.Rect(
+            round(prev.x + (rect.x - prev.x) * alpha),
+            round(prev.y + (rect.y - prev.y) * alpha),
+            round(prev.width + (rect.width - prev.width) * alpha),
+            round(prev.height + (rect.height - prev.height) * alpha)
+        )
+    
+    def draw(self, screen, alpha=1):
         """ Draws the player's segments.
+        screen --   (object -- pygame.Surface) The surface to draw the player on
+        alpha --    (float) How far (0 - 1) we are between logic ticks,
+                            see get_draw_rects
         returns -- (None)
         """
-        self.segments.draw(screen)
+        for color, rect in self.get_draw_rects(alpha):
+            # Segments are solid, fill their rect instead of blitting an image
+            # (so the head and tail don't need new images as they change size)
+            screen.fill(color, rect)
                 
-    def move_left(self):
-        """ Calculate user movement: left """
-        # If we aren't moving left/right
-        if self.direction not in ["left", "right"]:
+    def queue_turn(self, direction):
+        """ Adds a turn to the turns waiting to be made.
+        Turns are made at the start of a logic tick, see _apply_turn.
+        direction -- (str) "up", "right", "down", or "left"
+        returns --   (bool) Whether the turn was queued
+        """
+        # Ignore the turn if too many are waiting
+        if len(self.turns) >= self.MAX_TURNS:
+            return False
+        # Ignore the turn if it repeats the last turn waiting
+        if self.turns and self.turns[-1][0] == direction:
+            return False
+        self.turns.append([direction, self.ticks])
+        return True
+    
+    def can_turn(self, direction):
+        """ Checks if a turn can be made now.
+        direction -- (str) "up", "right", "down", or "left"
+        returns --   (bool)
+        """
+        # If there is more than one segment
+        if len(self.segment_list) > 1:
+            # If the second segment is
+            # running the opposite direction as this new segment
+            seg2 = self.segment_list[1]
+            seg1 = self.segment_list[0]
+            if seg2.direction == self.OPPOSITES[direction]:
+                # Because we are going to be running parallel
+                # with the second segment, if we aren't at least one segment
+                # thickness away from the second segment, we will collide with
+                # the second segment. To prevent that, wait until our first
+                # segment is at least twice as long as our thickness.
+                return seg1.length > (self.thickness * 2) + 1
+        return True
+    
+    def _apply_turn(self):
+        """ Makes the first turn waiting, if it can be made now.
+        Turns along the direction we are already moving are dropped,
+        turns that can't be made yet keep waiting (we keep our direction).
+        returns -- (None)
+        """
+        while self.turns:
+            direction, queued = self.turns[0]
+            # If we are already moving along this direction
+            if direction in [self.direction, self.OPPOSITES[self.direction]]:
+                # there is no turn to make
+                self.turns.popleft()
+                continue
+            # If we can't turn yet, keep waiting
+            if not self.can_turn(direction):
+                return
+            self.turns.popleft()
             # Change our direction
-            self.direction = "left"
+            self.direction = direction
             # Create new segment
             self.create_segment()
+            # record how long the turn waited
+            latency = self.ticks - queued
+            self.turn_latency["last"] = latency
+            if latency > self.turn_latency["max"]:
+                self.turn_latency["max"] = latency
+            return
+    
+    def move_left(self):
+        """ Calculate user movement: left """
+        self.queue_turn("left")
     
     def move_right(self):
         """ Calculate user movement: right """
-        # If we aren't moving left/right
-        if self.direction not in ["left", "right"]:
-            # Change our direction
-            self.direction = "right"
-            # Create new segment
-            self.create_segment()
+        self.queue_turn("right")
        
     def move_up(self):
         """ Calculate user movement: up """
-        # If we aren't moving up/down
-        if self.direction not in ["up", "down"]:
-            # Change our direction
-            self.direction = "up"
-            # Create new segment
-            self.create_segment()
+        self.queue_turn("up")
        
     def move_down(self):
         """ Calculate user movement: down """
-        # If we aren't moving up/down
-        if self.direction not in ["up", "down"]:
-            # Change our direction
-            self.direction = "down"
-            # Create new segment
-            self.create_segment()
+        self.queue_turn("down")
       
     def change_velocity(self, change):
         """ Changes the velocity of the player.
         change --   (int) The amount to increase the velocity by in pixesl per second.
         returns --  (none)
         """
-        # Make change relative to framerate
-        self.velocity += change / self.game.fps
+        # Make change relative to logic tick rate
+        self.velocity += change / self.game.tick_rate
         
\ No newline at end of file
@@ -0,0 +1,141 @@
+# import modules
+import cProfile
+import os
+import sys
+import threading
+# define classes
+class SamplingProfiler(object):
+    """ Samples the call stack of a thread at an interval, from another
+    thread, counting how often each stack is seen. The thread being
+    sampled isn't slowed down by tracing every call, like with cProfile.
+    """
+
+    def __init__(self, interval=0.005, thread=False):
+        """ Constructor
+        interval -- (float) The number of seconds between samples
+        thread --   (object -- threading.Thread) The thread to sample,
+                    defaults to the thread the profiler is created in
+        """
+        self.interval = interval
+        if thread is False:
+            thread = threading.current_thread()
+        self.thread_id = thread.ident
+        # count the samples of each stack, stored as a tuple of frame names
+        # (outermost frame first)
+        self.stacks = {}
+        self.samples = 0
+        # the sampling thread, and the event that stops it
+        self.sampler = None
+        self.stopped = threading.Event()
+
+    def get_frame_name(self, code):
+        """ Gets the name of a frame, for collapsed stacks.
+        code --     (object -- code) The frame's code
+        returns --  (str) The function, and the file and line it's defined at
+        """
+        return "{0} ({1}:{2})".format(
+            code.co_name, os.path.basename(code.co_filename), code.co_firstlineno
+        )
+
+    def sample(self):
+        """ Takes one sample of the thread's stack.
+        returns --  (None)
+        """
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None:
+            stack.append(self.get_frame_name(frame.f_code))
+            frame = frame.f_back
+        stack = tuple(reversed(stack))
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+
+    def _run(self):
+        # sample until we are stopped
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        """ Starts sampling, in a new thread.
+        returns --  (None)
+        """
+        self.stopped.clear()
+        self.sampler = threading.Thread(target=self._run, daemon=True)
+        self.sampler.start()
+
+    def stop(self):
+        """ Stops sampling, waiting for the sampling thread to end.
+        returns --  (None)
+        """
+        self.stopped.set()
+        self.sampler.join()
+        self.sampler = None
+
+    def save(self, filename):
+        """ Writes the stacks seen in the collapsed stack format read by
+        flame graph tools, one "frame;frame;frame count" line per stack.
+        filename -- (str) The file to write
+        returns --  (None)
+        """
+        with open(filename, "w") as file:
+            for stack, count in sorted(self.stacks.items()):
+                file.write("{0} {1}\n".format(";".join(stack), count))
+
+
+class Profiler(object):
+    """ Profiles a call with cProfile, a sampling profiler, or both. """
+
+    # Define the kinds of profiling, and the extension of the file each writes
+    EXTENSIONS = {
+        "cprofile": ".prof",
+        "sampling": ".folded"
+    }
+
+    def __init__(self, filename, kinds=False, interval=0.005):
+        """ Constructor
+        filename -- (str) The file to write to, without its extension,
+                          each kind of profile adds its own extension
+        kinds --    (list -- str) The kinds of profiling, see EXTENSIONS,
+                                  defaults to sampling only (each kind
+                                  skews the other's numbers)
+        interval -- (float) The number of seconds between samples
+        """
+        self.filename = filename
+        if kinds is False:
+            kinds = ["sampling"]
+        self.kinds = kinds
+        self.interval = interval
+
+    def run(self, func, *args):
+        """ Calls a function while profiling it, writing the profiles
+        when it returns (or raises).
+        func --     (function) The function to profile
+        args --     (mixed) The arguments to call the function with
+        returns --  (mixed) What the function returns
+        """
+        profile = None
+        sampler = None
+        # The sampler would mostly see cProfile's tracing, and cProfile
+        # would time the sampler holding the GIL
+        if len(self.kinds) > 1:
+            print(
+                "Profiling with {0} at once, each skews the other's numbers"
+                .format(" and ".join(self.kinds)), file=sys.stderr
+            )
+        if "cprofile" in self.kinds:
+            profile = cProfile.Profile()
+        if "sampling" in self.kinds:
+            sampler = SamplingProfiler(self.interval)
+            sampler.start()
+        try:
+            if profile is not None:
+                return profile.runcall(func, *args)
+            return func(*args)
+        finally:
+            if sampler is not None:
+                sampler.stop()
+                sampler.save(self.filename + self.EXTENSIONS["sampling"])
+            if profile is not None:
+                profile.dump_stats(self.filename + self.EXTENSIONS["cprofile"])
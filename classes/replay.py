@@ -0,0 +1,179 @@
+# import modules
+import struct
+# Define the replay file format
+EXTENSION = ".snr"
+MAGIC = b"SNKR"
+VERSION = 2
+# header after the magic: version, seed, tick rate
+HEADER = struct.Struct("<BQH")
+# Define the action codes, each record is a varint of (tick delta << 3 | code)
+ACTIONS = ["left", "right", "up", "down"]
+END = 7
+
+
+def write_varint(out, value):
+    """ Writes an unsigned int using as few bytes as possible
+    (7 bits per byte, high bit set on every byte but the last).
+    out --      (bytearray) The bytes to write to
+    value --    (int) The value to write, must not be negative
+    returns --  (None)
+    """
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """ Reads an unsigned int written by write_varint.
+    data --     (bytes) The bytes to read from
+    pos --      (int) The position to start reading at
+    returns --  (tuple) The value, and the position after it
+    """
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Replay ended in the middle of a record")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+class Replay(object):
+    """ A recorded game: the seed it was played with,
+    and every player action with the logic tick it was made on.
+    """
+    
+    def __init__(self, seed, tick_rate, actions=None, end_tick=None, score=None):
+        """ Constructor
+        seed --      (int) The seed the game's random streams were created with
+        tick_rate -- (int) The logic ticks per second of the game
+        actions --   (list) [tick, action] pairs, in order
+        end_tick --  (int) The tick the game ended on (None if it didn't end)
+        score --     (int) The final score (None if the game didn't end)
+        """
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.actions = actions if actions is not None else []
+        self.end_tick = end_tick
+        self.score = score
+    
+    def to_bytes(self):
+        """ Encodes the replay in the binary replay format.
+        returns --  (bytes)
+        """
+        out = bytearray(MAGIC)
+        out += HEADER.pack(VERSION, self.seed, self.tick_rate)
+        last = 0
+        for tick, action in self.actions:
+            write_varint(out, ((tick - last) << 3) | ACTIONS.index(action))
+            last = tick
+        # If the game ended, write its end and final score
+        if self.end_tick is not None:
+            write_varint(out, ((self.end_tick - last) << 3) | END)
+            write_varint(out, self.score)
+        return bytes(out)
+    
+    @staticmethod
+    def from_bytes(data):
+        """ Decodes a replay in the binary replay format.
+        data --     (bytes) The encoded replay
+        returns --  (object -- Replay)
+        """
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a replay file")
+        pos = len(MAGIC)
+        version, seed, tick_rate = HEADER.unpack_from(data, pos)
+        if version != VERSION:
+            raise ValueError("Unsupported replay version {0}".format(version))
+        pos += HEADER.size
+        replay = Replay(seed, tick_rate)
+        tick = 0
+        while pos < len(data):
+            value, pos = read_varint(data, pos)
+            tick += value >> 3
+            code = value & 0x07
+            if code == END:
+                replay.end_tick = tick
+                replay.score, pos = read_varint(data, pos)
+                break
+            if code >= len(ACTIONS):
+                raise ValueError("Unknown replay action {0}".format(code))
+            replay.actions.append([tick, ACTIONS[code]])
+        return replay
+    
+    def save(self, filename):
+        """ Writes the replay to a file.
+        filename -- (str) The file to write to
+        returns --  (None)
+        """
+        with open(filename, 'wb') as file:
+            file.write(self.to_bytes())
+    
+    @staticmethod
+    def load(filename):
+        """ Reads a replay from a file.
+        filename -- (str) The file to read
+        returns --  (object -- Replay)
+        """
+        with open(filename, 'rb') as file:
+            return Replay.from_bytes(file.read())
+
+
+class Recorder(object):
+    """ Records the actions of a game as it is played. """
+    
+    def __init__(self, seed, tick_rate, filename=False):
+        """ Constructor
+        seed --      (int) The seed the game's random streams were created with
+        tick_rate -- (int) The logic ticks per second of the game
+        filename --  (str) (optional) Where to save the replay when finished
+        """
+        self.replay = Replay(seed, tick_rate)
+        self.filename = filename
+    
+    def record(self, tick, action):
+        """ Records a player action.
+        tick --     (int) The logic tick the action is made before
+        action --   (str) "left", "right", "up", or "down"
+        returns --  (None)
+        """
+        self.replay.actions.append([tick, action])
+    
+    def finish(self, tick, score):
+        """ Records the end of the game, and saves the replay (if we have a
+        filename).
+        tick --     (int) The logic tick the game ended on
+        score --    (int) The final score
+        returns --  (object -- Replay) The finished replay
+        """
+        self.replay.end_tick = tick
+        self.replay.score = score
+        if self.filename:
+            self.replay.save(self.filename)
+        return self.replay
+
+
+class Playback(object):
+    """ Feeds the actions of a replay back into a game. """
+    
+    def __init__(self, replay):
+        """ Constructor
+        replay --   (object -- Replay) The replay to play back
+        """
+        self.replay = replay
+        # the next action to make
+        self.index = 0
+    
+    def feed(self, game):
+        """ Makes all the actions recorded for the game's current tick.
+        game --     (object -- Game) The game being played back
+        returns --  (None)
+        """
+        actions = self.replay.actions
+        while self.index < len(actions) and actions[self.index][0] <= game.ticks:
+            game.move_player(actions[self.index][1])
+            self.index += 1
@@ -0,0 +1,193 @@
+# import modules
+import pygame
+# import classes
+from .text import Text
+# define class
+class ScoreScreen(object):
+    """ Shows the high score name entry, and the high scores list,
+    over the board once a game is over. Keys are passed to it by the game's
+    event handlers, and the scores are read and written by HighScores
+    in the background, so the game keeps running while it's open.
+    """
+
+    # Define the size of the box shown on the board
+    SIZE = (400, 440)
+    # Define the longest name that can be entered
+    MAX_NAME = 16
+    # Define the fonts used
+    TITLE_FONT = ["Arial", 24, True]
+    ROW_FONT = ["Arial", 18]
+
+    def __init__(self, game):
+        """ Constructor
+        game --     (object -- Game) The game whose high scores are shown
+        """
+        self.game = game
+        # the screen shown: None (closed), "entry", "saving", "list",
+        # or "failed" (the score couldn't be saved)
+        self.state = None
+        self.score = 0
+        self.name = ""
+        self.scores = []
+        # the score submitted, highlighted in the list
+        self.submitted = None
+        # the box shown, redrawn whenever what it shows changes
+        # (created when first shown)
+        self.surface = None
+        self.changed = True
+
+    def is_open(self):
+        """ Checks if anything is shown.
+        returns --  (bool)
+        """
+        return self.state is not None
+
+    def _set_state(self, state):
+        self.state = state
+        self.changed = True
+
+    def open_entry(self, score):
+        """ Asks for the name to submit a high score with.
+        score --    (int) The high score
+        returns --  (None)
+        """
+        self.score = score
+        self.name = ""
+        self.submitted = None
+        self._set_state("entry")
+
+    def open_list(self, scores):
+        """ Shows the high scores list.
+        scores --   (list) The high scores, as [name, score]
+                    (None) If the high scores couldn't be saved or read,
+                           says so instead
+        returns --  (None)
+        """
+        if scores is None:
+            self._set_state("failed")
+            return
+        self.scores = scores
+        self._set_state("list")
+
+    def close(self):
+        """ Hides the screen.
+        returns --  (None)
+        """
+        self._set_state(None)
+
+    def submit(self):
+        """ Submits the high score with the name entered,
+        showing the list once it's saved.
+        returns --  (None)
+        """
+        name = self.name.strip()
+        # If no name was entered, use a default name
+        if not name:
+            name = Text.get_string("score006player")
+        self.submitted = [name, self.score]
+        self._set_state("saving")
+        self.game.high_scores.add_score(name, self.score, self.open_list)
+
+    def handle_key(self, e):
+        """ Handles a key being pressed while the screen is open.
+        e --        (object -- pygame.event.Event) The KEYDOWN event
+        returns --  (None)
+        """
+        if self.state == "entry":
+            if e.key in [pygame.K_RETURN, pygame.K_KP_ENTER]:
+                self.submit()
+            elif e.key == pygame.K_ESCAPE:
+                # skip submitting the score
+                self.close()
+            elif e.key == pygame.K_BACKSPACE:
+                self.name = self.name[:-1]
+                self.changed = True
+            elif e.unicode and e.unicode.isprintable():
+                if len(self.name) < self.MAX_NAME:
+                    self.name += e.unicode
+                    self.changed = True
+        elif self.state in ["list", "failed"]:
+            if e.key in [pygame.K_RETURN, pygame.K_KP_ENTER,
+                         pygame.K_ESCAPE, pygame.K_SPACE]:
+                self.close()
+
+    def _render(self):
+        """ Redraws the box to show the current screen.
+        returns --  (None)
+        """
+        msgs = self.game.messages
+        color = self.game.colors["text"]
+        size = self.SIZE
+        if self.surface is None:
+            self.surface = pygame.Surface(size)
+        surface = self.surface
+        surface.fill(self.game.colors["text_fill"])
+        pygame.draw.rect(surface, color, [0, 0, size[0], size[1]], 2)
+        # If we are asking for a name (or couldn't save it)
+        if self.state in ["entry", "saving", "failed"]:
+            lines = [
+                [msgs.render_text("STRID|score002new", color, self.ROW_FONT), 80],
+                [msgs.render_text(
+                    "{{STRID|info001score}}: {0}".format(self.score),
+                    color, self.TITLE_FONT
+                ), 130],
+                # show the name with a cursor after it
+                [msgs.render_text(
+                    self.name + ("_" if self.state == "entry" else ""),
+                    self.game.BLUE, self.TITLE_FONT
+                ), 220]
+            ]
+            if self.state == "entry":
+                footer = "STRID|score003submit"
+            elif self.state == "saving":
+                footer = "STRID|score004saving"
+            else:
+                footer = "STRID|score005close"
+                lines.append([msgs.render_text(
+                    "STRID|score007failed", self.game.RED, self.ROW_FONT
+                ), 290])
+            lines.append([msgs.render_text(footer, color, self.ROW_FONT), 340])
+            for line in lines:
+                x = msgs.center(line[0], size, True, False)
+                surface.blit(line[0], [x, line[1]])
+        else:
+            # Show the list
+            title = msgs.render_text("STRID|score001title", color, self.TITLE_FONT)
+            surface.blit(title, [msgs.center(title, size, True, False), 15])
+            y = 60
+            highlighted = False
+            for i, score in enumerate(self.scores):
+                row_color = color
+                # highlight the score just submitted (only once, if it ties)
+                if not highlighted and score == self.submitted:
+                    row_color = self.game.BLUE
+                    highlighted = True
+                place = msgs.render_text(
+                    "{0}.".format(i + 1), row_color, self.ROW_FONT
+                )
+                name = msgs.render_text(score[0], row_color, self.ROW_FONT)
+                points = msgs.render_text(
+                    str(score[1]), row_color, self.ROW_FONT
+                )
+                surface.blit(place, [40, y])
+                surface.blit(name, [90, y])
+                surface.blit(points, [size[0] - 40 - points.get_width(), y])
+                y += 22
+            footer = msgs.render_text("STRID|score005close", color, self.ROW_FONT)
+            surface.blit(
+                footer,
+                [msgs.center(footer, size, True, False), size[1] - 35]
+            )
+        self.changed = False
+
+    def draw(self, board):
+        """ Draws the screen (if open) centered on the board.
+        board --    (object -- pygame.Surface) The board to draw on
+        returns --  (None)
+        """
+        if not self.is_open():
+            return
+        if self.changed:
+            self._render()
+        center = self.game.messages.center(self.surface, self.game.BOARD_SIZE)
+        board.blit(self.surface, center)
@@ -0,0 +1,360 @@
+# import modules
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import time
+
+def write_file(filename, data):
+    """ Writes a file durably, replacing the old file only once the new
+    file is completely on disk.
+    filename -- (str) The file to write
+    data --     (str) The contents of the file
+    returns --  (None)
+    """
+    temp = filename + ".tmp"
+    with open(temp, 'w') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp, filename)
+    # make sure the rename is on disk too (not all systems can do this)
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(filename)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+# define classes
+class ScoreStore(object):
+    """ Base class for the places high scores are kept.
+    Scores are kept as [name, score], the highest score first,
+    scores that tie are in the order they were added.
+    """
+
+    def add(self, name, score):
+        """ Adds a score.
+        name --     (str) The name of the person who scored
+        score --    (int) The score
+        returns --  (None)
+        """
+        raise NotImplementedError
+
+    def top(self, n):
+        """ Gets the highest scores.
+        n --        (int) The number of scores to get
+        returns --  (list) Up to n scores, as [name, score]
+        """
+        raise NotImplementedError
+
+    def rank(self, score):
+        """ Gets the place a new score would get in the list.
+        score --    (int) The score
+        returns --  (int) The place, 1 is the highest
+        """
+        raise NotImplementedError
+
+    def count(self):
+        """ Gets the number of scores kept.
+        returns --  (int)
+        """
+        raise NotImplementedError
+
+    def qualifies(self, score, n):
+        """ Checks if a new score would be one of the highest scores.
+        score --    (int) The score
+        n --        (int) The number of highest scores
+        returns --  (bool)
+        """
+        return self.rank(score) <= n
+
+    def close(self):
+        """ Releases anything the store holds open.
+        returns --  (None)
+        """
+        pass
+
+
+class JSONScoreStore(ScoreStore):
+    """ Keeps the highest scores in a JSON file, as a list of [name, score].
+    The whole file is rewritten each time a score is added,
+    and only the highest max_scores are kept.
+    Inherits -- ScoreStore
+    """
+
+    def __init__(self, filename, max_scores=15):
+        """ Reads the scores from the file (if it exists).
+        filename --     (str) The file the scores are kept in
+        max_scores --   (int) The number of scores to keep
+        """
+        self.filename = filename
+        self.max_scores = max_scores
+        self.list = []
+        if os.path.exists(filename):
+            with open(filename, 'r') as file:
+                self.list = json.load(file)
+
+    def add(self, name, score):
+        # append the score, and sort the list (ties keep their order)
+        self.list.append([name, score])
+        self.list.sort(key=lambda v: v[1], reverse=True)
+        # only keep the highest scores
+        del self.list[self.max_scores:]
+        # write the new list next to the old one, then replace it,
+        # so a crash can't leave half a list
+        write_file(self.filename, json.dumps(self.list))
+
+    def top(self, n):
+        return [list(s) for s in self.list[:n]]
+
+    def rank(self, score):
+        # a new score goes after the scores it ties
+        return sum(1 for s in self.list if s[1] >= score) + 1
+
+    def count(self):
+        return len(self.list)
+
+
+class SQLiteScoreStore(ScoreStore):
+    """ Keeps every score in an SQLite database, indexed by score,
+    so adding a score, getting the highest scores, and checking if a score
+    is one of them don't depend on how many scores are kept.
+    Ranking a score counts the scores above it in the index, so it takes
+    longer the more scores are above it (O(k)). The game only checks if a
+    score is one of the highest (see qualifies), which doesn't count.
+    Inherits -- ScoreStore
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            played REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+    """
+
+    def __init__(self, filename):
+        """ Opens the database, creating it if it doesn't exist.
+        filename -- (str) The database file
+        """
+        self.filename = filename
+        self.db = sqlite3.connect(filename)
+        # write ahead logging only appends to the log on each commit
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(self.SCHEMA)
+
+    def add(self, name, score):
+        with self.db:
+            self.db.execute(
+                "INSERT INTO scores (name, score, played) VALUES (?, ?, ?)",
+                (name, score, time.time())
+            )
+
+    def top(self, n):
+        rows = self.db.execute(
+            "SELECT name, score FROM scores ORDER BY score DESC, id LIMIT ?",
+            (n,)
+        )
+        return [list(row) for row in rows]
+
+    def rank(self, score):
+        # count the scores it goes after, from the index
+        # (walks the index entries above the score, see the class docstring)
+        row = self.db.execute(
+            "SELECT COUNT(*) FROM scores WHERE score >= ?", (score,)
+        ).fetchone()
+        return row[0] + 1
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def qualifies(self, score, n):
+        # only look at the nth highest score, instead of counting
+        row = self.db.execute(
+            "SELECT score FROM scores ORDER BY score DESC, id LIMIT 1 OFFSET ?",
+            (n - 1,)
+        ).fetchone()
+        return row is None or score > row[0]
+
+    def close(self):
+        self.db.close()
+
+
+class JournalScoreStore(ScoreStore):
+    """ Keeps every score in an append-only journal, one line per score,
+    each written to disk before add returns. Every so often the journal is
+    compacted, in the background, into a snapshot of the scores sorted by
+    score, and a new journal is started. The scores are kept in memory,
+    loaded from the snapshot and the journals when opened. New scores are
+    appended, and only sorted when the scores are next read (sorting a
+    sorted list with a few scores after it is cheap).
+    Inherits -- ScoreStore
+    """
+
+    # The number of scores added to the journal before it is compacted
+    compact_every = 100
+
+    def __init__(self, filename):
+        """ Opens the journal, recovering the scores from the last snapshot
+        and the journals written since.
+        filename -- (str) The journal, the journal being compacted is kept
+                          at filename.1 and the snapshot at filename.snapshot
+        """
+        self.filename = filename
+        self.old_filename = filename + ".1"
+        self.snapshot_filename = filename + ".snapshot"
+        # store the scores as (-score, number, name), highest first
+        # (once sorted), each score is numbered in the order it was added
+        self.scores = []
+        self.sorted = True
+        self.last_number = 0
+        # guards the scores and the journal, scores may be added from
+        # more than one thread
+        self.lock = threading.Lock()
+        self.compactor = None
+        self.recover()
+        # append to the journal
+        self.journal = self._open_journal()
+        self.journaled = 0
+
+    def _open_journal(self):
+        # open the journal to append lines to, exactly as written
+        return open(self.filename, 'a', encoding="utf-8", newline="\n")
+
+    def _read_journal(self, filename, after):
+        """ Reads the scores in a journal, ignoring a partly written last line
+        (e.g. from a crash), and any scores already in the snapshot.
+        filename -- (str) The journal
+        after --    (int) The number of the last score in the snapshot
+        returns --  (int) The length of the journal up to the last whole line
+        """
+        if not os.path.exists(filename):
+            return 0
+        length = 0
+        with open(filename, 'r', encoding="utf-8", newline="\n") as file:
+            for line in file:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    number, name, score = json.loads(line)
+                except ValueError:
+                    break
+                length += len(line.encode())
+                if number > after:
+                    self.scores.append((-score, number, name))
+                    self.last_number = max(self.last_number, number)
+        return length
+
+    def recover(self):
+        """ Loads the scores from the snapshot and the journals,
+        finishing a compaction a crash interrupted.
+        returns --  (None)
+        """
+        after = 0
+        if os.path.exists(self.snapshot_filename):
+            with open(self.snapshot_filename, 'r') as file:
+                snapshot = json.load(file)
+            after = snapshot["last"]
+            self.scores = [(-s[1], s[2], s[0]) for s in snapshot["scores"]]
+        self.last_number = after
+        self._read_journal(self.old_filename, after)
+        length = self._read_journal(self.filename, after)
+        # cut off a partly written line, so new lines aren't appended to it
+        if os.path.exists(self.filename) and length < os.path.getsize(self.filename):
+            with open(self.filename, 'r+') as file:
+                file.truncate(length)
+        self.scores.sort()
+        # If a compaction was interrupted, finish it now
+        if os.path.exists(self.old_filename):
+            self._write_snapshot(list(self.scores), self.last_number)
+
+    def _write_snapshot(self, scores, last):
+        """ Writes a snapshot, and removes the journal it replaces.
+        scores --   (list) The scores, see self.scores
+        last --     (int) The number of the last score in the snapshot
+        returns --  (None)
+        """
+        write_file(self.snapshot_filename, json.dumps({
+            "last": last,
+            "scores": [[s[2], -s[0], s[1]] for s in scores]
+        }))
+        if os.path.exists(self.old_filename):
+            os.remove(self.old_filename)
+
+    def compact(self, wait=False):
+        """ Starts a new journal, and compacts the old one (with the last
+        snapshot) into a new snapshot in the background.
+        wait --     (bool) Wait for the compaction to finish
+        returns --  (None)
+        """
+        with self.lock:
+            # Only compact one journal at a time
+            if self.compactor is not None and self.compactor.is_alive():
+                compactor = self.compactor
+            else:
+                # move the journal aside, scores are now added to a new one
+                self.journal.close()
+                os.replace(self.filename, self.old_filename)
+                self.journal = self._open_journal()
+                self.journaled = 0
+                self._sort()
+                compactor = self.compactor = threading.Thread(
+                    target=self._write_snapshot,
+                    args=(list(self.scores), self.last_number),
+                    daemon=True
+                )
+                compactor.start()
+        if wait:
+            compactor.join()
+
+    def add(self, name, score):
+        with self.lock:
+            self.last_number += 1
+            # write the score to the journal, and wait for it to be on disk
+            self.journal.write(
+                json.dumps([self.last_number, name, score]) + "\n"
+            )
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+            # append the score, it is sorted when the scores are next read
+            self.scores.append((-score, self.last_number, name))
+            self.sorted = False
+            self.journaled += 1
+            full = self.journaled >= self.compact_every
+        if full:
+            self.compact()
+
+    def _sort(self):
+        # sort the scores added since they were last sorted
+        # (only called while holding the lock)
+        if not self.sorted:
+            self.scores.sort()
+            self.sorted = True
+
+    def top(self, n):
+        with self.lock:
+            self._sort()
+            return [[s[2], -s[0]] for s in self.scores[:n]]
+
+    def rank(self, score):
+        # a new score goes after the scores it ties
+        with self.lock:
+            self._sort()
+            return bisect.bisect_right(self.scores, (-score, float("inf"))) + 1
+
+    def count(self):
+        with self.lock:
+            return len(self.scores)
+
+    def close(self):
+        if self.compactor is not None:
+            self.compactor.join()
+        self.journal.close()
@@ -1,44 +1,42 @@
-# pygame and random modules requried
-import pygame
+# math module requried
 import math
-# define class
-class Segment(pygame.sprite.Sprite):
-    """ Class that defines a segment of our snake
-    Inherits -- PyGame Sprite class
+# pygame module requried
+import pygame
+# import classes
+from .block import Block
+# define classes
+class Straight(object):
+    """ The geometry of a straight part of a snake: a rect as wide as the
+    snake is thick, with a real (float) position and length, rounded down
+    to the rect. Player's Segments and CompactPlayer's Edges (see SnakeBody)
+    are both Straights, so either snake covers the same pixels.
     """
     
-    def __init__(self, color, position, thickness, direction):
-        """ Constructor
-        color --       (tuple) Group of RGB values
-        position --    (list -- int) x, y coordinates of segment's top left corner
-                                    (i.e. screen dimensions)
+    # (no attributes of our own, so slotted classes can be Straights)
+    __slots__ = []
+    
+    def set_straight (self, position, thickness, direction):
+        """ Makes us a straight part 1 pixel long.
+        position --    (list -- int) x, y coordinates of our top left corner
         thickness  --  (int) thickness of snake
-        orientation -- (str)    Whether this segment is moving
+        direction --   (str)    Whether we are moving
                                 "up", "right", "down", or "left"
+        returns --     (None)
         """
-        # call parent Sprite constructor
-        super().__init__()
-        
         self.direction = direction
-        # Create block image
+        # Calculate size
         if self.direction in ["left", "right"]:
-            self.image = pygame.Surface([1, thickness])
+            size = [1, thickness]
         else:
-            self.image = pygame.Surface([thickness, 1])
-        self.image.fill(color)
-        # Get rectangle object of our image from pygame
-        # draw player, position
-        self.rect = self.image.get_rect()
+            size = [thickness, 1]
+        self.rect = pygame.Rect(0, 0, size[0], size[1])
         self.rect.x = position[0]
         self.rect.y = position[1]
         # init length
         self.length = 1
-        # track the real position (float) of segment
-        self.realPos = {
-            "x": self.rect.x,
-            "y": self.rect.y
-        }
-        
+        # track the real position (float)
+        self.update_realPos()
+    
     def add_length (self, l):
         """ Adds or subtracts from length, modifiying dimensions as neccessary.
         l --        (float) The amount of length to add (negative values subtract)
@@ -47,45 +45,150 @@ class Segment(pygame.sprite.Sprite):
         # Update length
         self.length += l
         # Update dimensions
-        new_width = self.rect.width
-        new_height = self.rect.height
+        new_length = math.floor(self.length)
+        if new_length < 0:
+            new_length = 0
         if self.direction in ["left", "right"]:
-            new_width = math.floor(self.length)
-            if new_width < 0:
-                new_width = 0
+            self.rect.width = new_length
         else:
-            new_height = math.floor(self.length)
-            if new_height < 0:
-                new_height = 0
-        self.image = pygame.transform.scale(self.image, [new_width, new_height])
-        # get new rect
-        self.rect = self.image.get_rect()
-        self.rect.x = math.floor(self.realPos["x"])
-        self.rect.y = math.floor(self.realPos["y"])
-        # If we are moving down or right
+            self.rect.height = new_length
+        # update position
+        self.rect.x = math.floor(self.real_x)
+        self.rect.y = math.floor(self.real_y)
         return self.length
     
     def move_pos (self, vector):
-        """ Moves the segments by updating the x, y coordinates using the vector.
-        vector --   (list) x, y values, the amount to move the segment right/down
-        returns --  (object) The new real position
+        """ Moves us by updating the x, y coordinates using the vector.
+        vector --   (list) x, y values, the amount to move right/down
+        returns --  (None)
         """
-        #x = self.rect.x
-        #y = self.rect.y
         # update the real position
-        self.realPos["x"] += vector[0]
-        self.realPos["y"] += vector[1]
+        self.real_x += vector[0]
+        self.real_y += vector[1]
         # use the real position to update rect
-        self.rect.x = math.floor(self.realPos["x"])
-        self.rect.y = math.floor(self.realPos["y"])
-        #print (vector, [self.rect.x-x, self.rect.y-y])
-        # return the real position
-        return self.realPos
-     
+        self.rect.x = math.floor(self.real_x)
+        self.rect.y = math.floor(self.real_y)
+    
     def update_realPos (self):
-        """ Updates the realPos to the x, y properties of our rect.
+        """ Updates the real position to the x, y properties of our rect.
         returns --  (None)
         """
-        self.realPos["x"] = self.rect.x
-        self.realPos["y"] = self.rect.y
-    
\ No newline at end of file
+        self.real_x = self.rect.x
+        self.real_y = self.rect.y
+    
+    def place_after (self, head, thickness):
+        """ Positions us as the new head, after a turn from the last head,
+        which we evenly overlap by our thickness (at the corner).
+        head --         (object -- Straight) The last head
+        thickness --    (int) thickness of snake
+        returns --      (None)
+        """
+        # add the thickness of the previous head to our length
+        self.add_length(thickness)
+        rect = self.rect
+        # use our direction and head's direction to position ourselves
+        if head.direction == "up":
+            rect.top = head.rect.top
+            if self.direction == "left":
+                rect.right = head.rect.right
+            else:
+                rect.left = head.rect.left
+        if head.direction == "left":
+            if self.direction == "up":
+                rect.bottom = head.rect.bottom
+            else:
+                rect.top = head.rect.top
+            rect.left = head.rect.left
+        if head.direction == "down":
+            rect.bottom = head.rect.bottom
+            if self.direction == "left":
+                rect.right = head.rect.right
+            else:
+                rect.left = head.rect.left
+        if head.direction == "right":
+            if self.direction == "up":
+                rect.bottom = head.rect.bottom
+            else:
+                rect.top = head.rect.top
+            rect.right = head.rect.right
+        # Update our real position
+        self.update_realPos()
+    
+    def grow_front (self, vector, length):
+        """ Lengthens our front, as the head moves forward.
+        vector --   (list) x, y values, the amount the head moves right/down
+        length --   (float) The distance the head moves
+        returns --  (None)
+        """
+        self.add_length(length)
+        # (our top left is our front, if we are moving up or left)
+        if self.direction in ["up", "left"]:
+            self.move_pos(vector)
+    
+    def grow_back (self, length):
+        """ Lengthens our back, as the tail grows.
+        length --   (float) The length to add
+        returns --  (None)
+        """
+        self.add_length(length)
+        # (our top left is our back, if we are moving down or right)
+        if self.direction == "down":
+            self.move_pos([0, -length])
+        elif self.direction == "right":
+            self.move_pos([-length, 0])
+    
+    def shrink_back (self, length, thickness):
+        """ Shortens our back, as the tail moves forward.
+        length --       (float) The length to remove
+        thickness --    (int) thickness of snake, when we are no longer
+                              than it, we are used up (and don't move)
+        returns --      (float) Our new length
+        """
+        new_len = self.add_length(-length)
+        if new_len > thickness:
+            if self.direction == "down":
+                self.move_pos([0, length])
+            elif self.direction == "right":
+                self.move_pos([length, 0])
+        return new_len
+    
+    def get_front (self, thickness):
+        """ Gets the square at our front (the last thickness pixels of us),
+        used to detect collisions.
+        thickness --    (int) thickness of snake
+        returns --      (object -- pygame.Rect)
+        """
+        # Start with our position
+        front_pos = [self.rect.x, self.rect.y]
+        # If we are moving  right
+        if self.direction == "right":
+            # Add our length to our x position
+            front_pos[0] += (self.length - thickness)
+        # If we are moving down
+        elif self.direction == "down":
+            # Add our length to our y position
+            front_pos[1] += (self.length - thickness)
+        # Make it a square the size of our thickness, at our calculated position
+        return pygame.Rect(front_pos[0], front_pos[1], thickness, thickness)
+
+
+class Segment(Straight, Block):
+    """ Class that defines a segment of our snake
+    A segment is only geometry (a rect and a float length), Player draws
+    it by filling its rect.
+    Inherits -- Straight, Block class
+    """
+    
+    def __init__(self, color, position, thickness, direction):
+        """ Constructor
+        color --       (tuple) Group of RGB values
+        position --    (list -- int) x, y coordinates of segment's top left corner
+                                    (i.e. screen dimensions)
+        thickness  --  (int) thickness of snake
+        orientation -- (str)    Whether this segment is moving
+                                "up", "right", "down", or "left"
+        """
+        # call parent Block constructor
+        super().__init__(color, position, [thickness, thickness])
+        # make us 1 pixel long, at our position
+        self.set_straight(position, thickness, direction)
@@ -0,0 +1,80 @@
+# import modules
+from collections import deque
+# import classes
+from .segment import Straight
+# define classes
+class Edge(Straight):
+    """ A straight part of a SnakeBody, from one corner to the next.
+    It has the same geometry as a Segment, but it isn't a sprite (or in any
+    sprite group), so the level only indexes its rect, for collisions and
+    placing mice.
+    Inherits -- Straight
+    """
+
+    __slots__ = ["direction", "length", "real_x", "real_y", "rect"]
+
+    def __init__(self, position, thickness, direction):
+        """ Constructor, creates an edge 1 pixel long
+        position --    (list -- int) x, y coordinates of the edge's top left corner
+        thickness  --  (int) thickness of snake
+        direction --   (str) The direction the snake moves along the edge
+        """
+        self.set_straight(position, thickness, direction)
+
+
+class SnakeBody(object):
+    """ The shape of a snake, as the edges between the corners it turned at,
+    in a deque from its tail to its head. Only the head and tail edges move,
+    so moving costs the same however long the snake is, and turning doesn't
+    shift the other edges (unlike Player's list of segments, head first).
+    """
+
+    __slots__ = ["thickness", "edges"]
+
+    def __init__(self, position, thickness, direction="left"):
+        """ Constructor, creates a snake as long as its thickness (lengthen
+        its edge to make it longer)
+        position --     (list) x, y coordinates of the snake's top left corner
+        thickness --    (int) thickness of snake
+        direction --    (str) The direction the head is moving
+        """
+        self.thickness = thickness
+        # store the edges, from the tail to the head
+        self.edges = deque()
+        head = Edge(position, thickness, direction)
+        head.add_length(thickness)
+        self.edges.append(head)
+
+    def turn(self, direction):
+        """ Turns the head, starting a new edge at the corner where it is.
+        direction --    (str) The new direction
+        returns --      (object -- Edge) The new edge at the head
+        """
+        edge = Edge([0, 0], self.thickness, direction)
+        edge.place_after(self.edges[-1], self.thickness)
+        self.edges.append(edge)
+        return edge
+
+    def move(self, vector, length):
+        """ Moves the head forward, and the tail after it, see Player._move.
+        vector --   (list) x, y values, the amount the head moves right/down
+        length --   (float) The distance moved
+        returns --  (list) The edges the tail went past (and were removed)
+        """
+        head = self.edges[-1]
+        # A straight snake just moves
+        if len(self.edges) == 1:
+            head.move_pos(vector)
+            return []
+        head.grow_front(vector, length)
+        # shrink the tail, removing the edges it is no longer than the
+        # corner they overlap (and shrinking the next edge by what's left)
+        removed = []
+        while length > 0:
+            new_len = self.edges[0].shrink_back(length, self.thickness)
+            if new_len <= self.thickness:
+                removed.append(self.edges.popleft())
+                length = abs(new_len - self.thickness)
+            else:
+                length = 0
+        return removed
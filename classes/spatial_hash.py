@@ -0,0 +1,183 @@
+# define class
+class SpatialHash(object):
+    """ Indexes sprites by the cells of a uniform grid that their rects cover.
+    Looking for collisions with a rect only has to check the sprites in the
+    cells that rect covers, instead of every sprite.
+    Sprites must be updated in the index whenever their rect changes.
+    """
+    
+    def __init__(self, cell_size):
+        """ Constructor
+        cell_size --    (int) The width and height of each cell in pixels
+        """
+        self.cell_size = cell_size
+        # store the sprites in each cell, by (column, row)
+        self.cells = {}
+        # store the bounds of the cells each sprite covers
+        self.bounds = {}
+    
+    def __contains__(self, sprite):
+        return sprite in self.bounds
+    
+    def __len__(self):
+        return len(self.bounds)
+    
+    def get_bounds(self, rect):
+        """ Gets the cells covered by a rect.
+        rect --     (object -- pygame.Rect) The rect to get the cells of
+        returns --  (tuple) The first column, first row, last column, last row
+                    (None) If the rect is empty and covers no cells
+        """
+        # empty rects can't collide with anything
+        if rect.width <= 0 or rect.height <= 0:
+            return None
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            (rect.right - 1) // size,
+            (rect.bottom - 1) // size
+        )
+    
+    def snapshot(self):
+        """ Copies what is indexed, so the index can be restored to it.
+        returns --  (object) The copy, see restore
+        """
+        return [
+            {cell: set(sprites) for cell, sprites in self.cells.items()},
+            dict(self.bounds)
+        ]
+    
+    def restore(self, snapshot):
+        """ Restores the index to what it was when a snapshot was taken.
+        snapshot -- (object) The copy, from snapshot
+        returns --  (None)
+        """
+        self.cells = {cell: set(sprites) for cell, sprites in snapshot[0].items()}
+        self.bounds = dict(snapshot[1])
+    
+    def _add_to_cell(self, cell, sprite):
+        """ Adds a sprite to a single cell.
+        cell --     (tuple) The column, row of the cell
+        sprite --   (object -- pygame.sprite.Sprite) The sprite to add
+        returns --  (None)
+        """
+        if cell in self.cells:
+            self.cells[cell].add(sprite)
+        else:
+            self.cells[cell] = {sprite}
+    
+    def _remove_from_cell(self, cell, sprite):
+        """ Removes a sprite from a single cell, deleting the cell if empty.
+        cell --     (tuple) The column, row of the cell
+        sprite --   (object -- pygame.sprite.Sprite) The sprite to remove
+        returns --  (None)
+        """
+        sprites = self.cells[cell]
+        sprites.discard(sprite)
+        if not sprites:
+            del self.cells[cell]
+    
+    def add(self, sprite):
+        """ Adds a sprite to the index, using its current rect.
+        sprite --   (object -- pygame.sprite.Sprite) The sprite to add
+        returns --  (None)
+        """
+        # If the sprite is already indexed, just update it
+        if sprite in self.bounds:
+            self.update(sprite)
+            return
+        bounds = self.get_bounds(sprite.rect)
+        self.bounds[sprite] = bounds
+        if bounds is None:
+            return
+        # add sprite to every cell it covers
+        for col in range(bounds[0], bounds[2] + 1):
+            for row in range(bounds[1], bounds[3] + 1):
+                self._add_to_cell((col, row), sprite)
+    
+    def remove(self, sprite):
+        """ Removes a sprite from the index (if it is indexed).
+        sprite --   (object -- pygame.sprite.Sprite) The sprite to remove
+        returns --  (None)
+        """
+        if sprite not in self.bounds:
+            return
+        bounds = self.bounds.pop(sprite)
+        if bounds is None:
+            return
+        # remove sprite from every cell it covered
+        for col in range(bounds[0], bounds[2] + 1):
+            for row in range(bounds[1], bounds[3] + 1):
+                self._remove_from_cell((col, row), sprite)
+    
+    def update(self, sprite):
+        """ Updates the cells of a sprite after its rect has changed.
+        Only the cells the sprite entered or left are touched.
+        sprite --   (object -- pygame.sprite.Sprite) The sprite to update
+        returns --  (None)
+        """
+        old = self.bounds[sprite]
+        new = self.get_bounds(sprite.rect)
+        # If the sprite hasn't changed cells, there is nothing to do
+        if old == new:
+            return
+        self.bounds[sprite] = new
+        # remove the sprite from the cells it left
+        for cell in self._get_cells_outside(old, new):
+            self._remove_from_cell(cell, sprite)
+        # add the sprite to the cells it entered
+        for cell in self._get_cells_outside(new, old):
+            self._add_to_cell(cell, sprite)
+    
+    def _get_cells_outside(self, bounds, other):
+        """ Gets the cells within bounds that aren't within other bounds,
+        column by column, without looking at the cells within both
+        (so a long sprite that grows or shrinks at one end only touches
+        the cells at that end).
+        bounds --   (tuple) The bounds to get cells from, see get_bounds
+        other --    (tuple) The bounds to leave out
+        returns --  (generator) The column, row of each cell
+        """
+        if bounds is None:
+            return
+        first_col, first_row, last_col, last_row = bounds
+        # If the bounds don't overlap, every cell is outside
+        if other is None or other[0] > last_col or other[2] < first_col\
+                or other[1] > last_row or other[3] < first_row:
+            for col in range(first_col, last_col + 1):
+                for row in range(first_row, last_row + 1):
+                    yield (col, row)
+            return
+        # the columns left of the other bounds
+        for col in range(first_col, other[0]):
+            for row in range(first_row, last_row + 1):
+                yield (col, row)
+        # the columns they share, above and below the other bounds
+        if first_row < other[1] or last_row > other[3]:
+            for col in range(max(first_col, other[0]), min(last_col, other[2]) + 1):
+                for row in range(first_row, other[1]):
+                    yield (col, row)
+                for row in range(other[3] + 1, last_row + 1):
+                    yield (col, row)
+        # the columns right of the other bounds
+        for col in range(other[2] + 1, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                yield (col, row)
+    
+    def query(self, rect):
+        """ Finds the indexed sprites that collide with a rect.
+        rect --     (object -- pygame.Rect) The rect to check
+        returns --  (list) The sprites whose rects collide with rect
+        """
+        bounds = self.get_bounds(rect)
+        if bounds is None:
+            return []
+        # gather the sprites in the cells the rect covers
+        found = set()
+        for col in range(bounds[0], bounds[2] + 1):
+            for row in range(bounds[1], bounds[3] + 1):
+                if (col, row) in self.cells:
+                    found.update(self.cells[(col, row)])
+        # only return sprites that actually collide
+        return [s for s in found if rect.colliderect(s.rect)]
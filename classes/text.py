@@ -1,16 +1,28 @@
-# import other modules
-import xml.etree.ElementTree as ET
-# store strings in dict
+# store strings in dict (loaded when first needed, see get_string)
 _strings = {}
+_loaded = False
+# store the location of the data directory the strings are loaded from
+_directory = ''
 # create class
 class Text(object):
     """ Module that handles fetching and outputting text for the game. """
     
+    def set_directory(directory=''):
+        """ Sets where the strings are loaded from when they are first needed.
+        directory --    (string) The location of the data directory
+        returns --      (None)
+        """
+        global _directory
+        _directory = directory
+    
     def load(directory=''):
         """ Loads the strings for our game and stores them in memory.
         directory --    (string) The location of the data directory
         returns --      (None)
         """
+        global _loaded
+        # import the xml parser (only needed here)
+        import xml.etree.ElementTree as ET
         # load the strings from the xml file
         tree = ET.parse(directory+'data/strings.xml')
         strs = tree.getroot()
@@ -20,13 +32,16 @@ class Text(object):
             if "id" in s.attrib:
                 # store the string in the dictionary
                 _strings[s.attrib["id"]] = s.text
+        _loaded = True
     
     def get_string(strid):
-        """ Gets a string by its id.
+        """ Gets a string by its id, loading the strings if they haven't been.
         strid --    (string) The id of the string
         returns --  (string)    The string that matches the id,
                                 an empty string if id not found
         """
+        if not _loaded:
+            Text.load(_directory)
         if strid in _strings:
             return _strings[strid]
         return ""
@@ -0,0 +1,125 @@
+# import modules
+import pygame
+import math
+from collections import deque
+# define classes
+class Fade(object):
+    """ Slowly fades PyGame surfaces in or out over the board.
+    The fade doesn't run a loop of its own, it is advanced and drawn
+    one frame at a time by Transitions.
+    """
+    
+    def __init__(self, game, fades=[], direction="out", noFades=[],
+                 speed=1.5, on_done=None):
+        """ Constructor, copies the surfaces, so they may be changed after.
+        game --      (object -- Game) A reference to the current game
+        fades --     (list) A list of PyGame surfaces to fade
+        direction -- (str) "in" or "out" (If not "in", assumes "out")
+        noFades --   (list) A list of PyGame surfaces that don't fade
+        speed --     (float) The number of seconds for the fade to last
+        on_done --   (callable) Called once the fade is over (or skipped)
+        """
+        self.game = game
+        self.direction = direction
+        self.speed = speed
+        self.on_done = on_done
+        # seconds the fade has run for
+        self.elapsed = 0
+        # Create surfaces to store graphics
+        self.fade = pygame.Surface(game.BOARD_SIZE)
+        self.noFade = pygame.Surface(game.BOARD_SIZE)
+        # Make fade transparent
+        self.fade.fill(game.BLACK)
+        self.fade.set_colorkey(game.BLACK)
+        # add fades to fade surface
+        for s in fades:
+            self.fade.blit(s, [0, 0])
+        # add no fades to noFade surface
+        for s in noFades:
+            self.noFade.blit(s, [0, 0])
+    
+    def update(self, elapsed):
+        """ Advances the fade.
+        elapsed --  (float) The number of seconds that have passed
+        returns --  (bool) Whether the fade is over
+        """
+        self.elapsed += elapsed
+        return self.is_done()
+    
+    def is_done(self):
+        """ Checks if the fade is over.
+        returns --  (bool)
+        """
+        return self.elapsed >= self.speed
+    
+    def draw(self, board):
+        """ Draws the current frame of the fade.
+        board --    (object -- pygame.Surface) The surface to draw the fade on
+        returns --  (None)
+        """
+        # Determine how far we are through the fade (spread over 255)
+        a = min(math.ceil(255 * self.elapsed / self.speed), 255)
+        # Set alpha (fade in our out)
+        alpha = (0 + a) if self.direction == "in" else (255 - a)
+        # Set fade level for fade surface
+        self.fade.set_alpha(alpha)
+        # Fill the board with fill color
+        board.fill(self.game.colors["fill"])
+        # Copy surfaces to board
+        board.blit(self.noFade, [0, 0])
+        board.blit(self.fade, [0, 0])
+    
+    def finish(self):
+        """ Calls the fade's on_done callback.
+        returns --  (None)
+        """
+        if callable(self.on_done):
+            self.on_done()
+
+
+class Transitions(object):
+    """ Runs transitions (e.g. fades) one after another.
+    The main loop advances the current transition one frame at a time,
+    so the game keeps handling events while they run.
+    """
+    
+    def __init__(self):
+        # store the transitions waiting to run, the first is running
+        self.queue = deque()
+    
+    def add(self, transition):
+        """ Adds a transition to run after the ones already added.
+        transition -- (object) The transition (e.g. Fade)
+        returns --    (None)
+        """
+        self.queue.append(transition)
+    
+    def is_active(self):
+        """ Checks if a transition is running.
+        returns --  (bool)
+        """
+        return len(self.queue) > 0
+    
+    def update(self, elapsed):
+        """ Advances the current transition, moving to the next when it ends.
+        elapsed --  (float) The number of seconds that have passed
+        returns --  (None)
+        """
+        if self.queue and self.queue[0].update(elapsed):
+            # the transition is over, remove it and let it know
+            self.queue.popleft().finish()
+    
+    def skip(self):
+        """ Ends all transitions now, including any added as they end.
+        returns --  (None)
+        """
+        while self.queue:
+            self.queue.popleft().finish()
+    
+    def draw(self, board):
+        """ Draws the current frame of the current transition.
+        board --    (object -- pygame.Surface) The surface to draw on
+        returns --  (None)
+        """
+        if self.queue:
+            self.queue[0].draw(board)
@@ -1,9 +1,9 @@
-# pygame and module requried
-import pygame
+# import classes
+from .block import Block
 # define class
-class Wall(pygame.sprite.Sprite):
+class Wall(Block):
     """ Class that defines walls
-    Inherits -- PyGame Sprite class
+    Inherits -- Block class
     """
     
     def __init__(self, color, position, size):
@@ -12,15 +12,6 @@ class Wall(pygame.sprite.Sprite):
         position --     (list -- int) x, y coordinates of wall's top left corner
         size  --        (list -- int) width, height dimensions of block
         """
-        # call parent Sprite constructor
-        super(Wall, self).__init__()
-        # Create wall image
-        self.image = pygame.Surface([size[0], size[1]])
-        self.image.fill(color)
-        # Get rectangle object of our image from pygame
-        self.rect = self.image.get_rect()
-        # set position
-        self.rect.x = position[0]
-        self.rect.y = position[1]
+        # call parent Block constructor
+        super(Wall, self).__init__(color, position, size)
         
-    
\ No newline at end of file
@@ -1,31 +1,249 @@
+# Note when we started, to measure startup time (see --startup-time)
+import time
+STARTED = time.perf_counter()
 # Import modules
+import argparse
+import os
 import pygame
 
 # Import classes
+# (the classes only used by some options are imported when they are used)
 from classes.game import Game
 
 def main ():
-    # Initialize PyGame
-    pygame.init()
+    # Parse command line options
+    parser = argparse.ArgumentParser(description="Play Snake.")
+    parser.add_argument(
+        "--dirty-rects", action="store_true",
+        help="only update the parts of the screen that change while playing"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None,
+        help="seed for the first game's random numbers (e.g. mouse positions)"
+    )
+    parser.add_argument(
+        "--record", metavar="FILE",
+        help="record each game, saving it to FILE when it ends"
+    )
+    parser.add_argument(
+        "--replay", metavar="FILE",
+        help="play back a game recorded with --record"
+    )
+    parser.add_argument(
+        "--scores", metavar="FILE",
+        help="keep the high scores in FILE (default: data/scores.db), a .json"
+        " file keeps only the high scores shown, a .journal file keeps every"
+        " score in an append-only journal, any other file in an SQLite db"
+    )
+    parser.add_argument(
+        "--frame-times", metavar="FILE",
+        help="time each phase of every frame, saving the stats to FILE on exit"
+    )
+    parser.add_argument(
+        "--fps", type=int, default=None,
+        help="max frames per second (0 for no limit, default: 60)"
+    )
+    parser.add_argument(
+        "--frames", type=int, default=0,
+        help="stop after this many frames (default: run until closed)"
+    )
+    parser.add_argument(
+        "--bot", action="store_true",
+        help="let a bot play (unattended, without waiting to continue)"
+        ", stopping when its game is over, or after --bot-ticks logic ticks"
+        " (the bot can go round in circles forever)"
+    )
+    parser.add_argument(
+        "--bot-ticks", type=int, default=36000,
+        help="the most logic ticks a bot plays for, 0 for no limit"
+        " (default: 36000, 10 minutes at 60 ticks per second)"
+    )
+    parser.add_argument(
+        "--profile", metavar="FILE",
+        help="profile the game with --profiler, the sampling profiler saves"
+        " FILE.folded (collapsed stacks, for flame graphs), cProfile saves"
+        " FILE.prof (only with --profiler cprofile or both)"
+    )
+    parser.add_argument(
+        "--profiler", choices=["cprofile", "sampling", "both"],
+        default="sampling",
+        help="the profiler(s) used by --profile (default: sampling), both"
+        " profilers at once skew each other's numbers"
+    )
+    parser.add_argument(
+        "--compact-snake", action="store_true",
+        help="keep the snake as a slotted edge per corner, instead of a sprite"
+        " per corner (the game plays the same either way)"
+    )
+    parser.add_argument(
+        "--startup-time", action="store_true",
+        help="show how long each step of starting up took, up to the first"
+        " frame, then exit"
+    )
+    args = parser.parse_args()
+    # note when each step of starting up finished
+    startup = Startup(STARTED)
+    startup.mark("imports")
+    # paths are relative to where we were run, not to the game
+    for name in ["record", "replay", "scores", "frame_times", "profile"]:
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    # Initialize the parts of PyGame we use (the game has no sound,
+    # so don't wait for the audio device)
+    pygame.display.init()
+    pygame.font.init()
+    startup.mark("pygame")
     # Instantiate game
-    game = Game ("Snake")
-    # Load game
-    game.load()
+    game = Game (
+        "Snake",
+        fps=args.fps if args.fps is not None else False,
+        dirty_rects=args.dirty_rects,
+        snake_model="corners" if args.compact_snake else False,
+        scores_file=args.scores if args.scores else False
+    )
+    startup.mark("game")
+    # If we are recording, record every game
+    if args.record:
+        game.record(args.record)
+    # If a bot is playing, nobody is there to press keys
+    bot = None
+    if args.bot:
+        from classes.bot import Bot
+        bot = Bot(game)
+        game.unattended = True
+    # Load game (or replay)
+    if args.replay:
+        from classes.replay import Replay
+        game.play(Replay.load(args.replay))
+    else:
+        game.load(args.seed)
+    startup.mark("load")
     
-    # ------ Main Program Loop ------
-    while game.is_running():
-        # Process events (e.g. keystrokes, mouseclicks)
+    # If we are only measuring startup, show the first frame and stop
+    if args.startup_time:
         game.process_events()
-        # Run game logic (e.g. object positions, player attributes)
-        game.run_logic()
-        # Draw the current frame (e.g. the graphics)
         game.display_frame()
-        # Pause until next frame
-        game.update_clock()
+        startup.mark("first frame")
+        print(startup.get_report())
+        game.stop()
+        pygame.quit()
+        return
+    
+    # If we are timing frames, create the timer
+    timer = None
+    if args.frame_times:
+        from classes.frame_timer import FrameTimer
+        timer = FrameTimer(game.fps)
+    
+    # Run the game (profiling it, if we are)
+    if args.profile:
+        from classes.profiler import Profiler
+        kinds = list(Profiler.EXTENSIONS) if args.profiler == "both"\
+            else [args.profiler]
+        Profiler(args.profile, kinds).run(
+            run, game, timer, bot, args.frames, args.bot_ticks
+        )
+    else:
+        run(game, timer, bot, args.frames, args.bot_ticks)
 
+    # If we timed frames, save the stats
+    if timer:
+        timer.save(args.frame_times)
     # Once the main program loop has stopped (program finished running),
     # Close all open windows
     pygame.quit()
 
+class Startup(object):
+    """ Notes how long each step of starting up takes. """
+    
+    def __init__(self, started):
+        """ Constructor
+        started --  (float) When we started, from time.perf_counter()
+        """
+        self.started = started
+        # store each step, as [name, finished]
+        self.steps = []
+    
+    def mark(self, name):
+        """ Notes that a step has finished.
+        name --     (str) The name of the step
+        returns --  (None)
+        """
+        self.steps.append([name, time.perf_counter()])
+    
+    def get_report(self):
+        """ Gets how long each step took, and how long since we started.
+        returns --  (str) A line per step, in milliseconds
+        """
+        lines = ["{0:<12} {1:>9} {2:>9}".format("step", "ms", "total ms")]
+        last = self.started
+        for name, finished in self.steps:
+            lines.append("{0:<12} {1:>9.1f} {2:>9.1f}".format(
+                name, (finished - last) * 1000, (finished - self.started) * 1000
+            ))
+            last = finished
+        return "\n".join(lines)
+
+def run (game, timer=None, bot=None, frames=0, bot_ticks=0):
+    """ Runs the main program loop, until the game stops.
+    game --     (object -- Game) The loaded game
+    timer --    (object -- FrameTimer) (optional) Times each frame
+    bot --      (object -- Bot) (optional) Plays the game,
+                                the loop stops when its game is over
+    frames --   (int) The number of frames to stop after, 0 for no limit
+    bot_ticks --(int) The number of logic ticks to stop a bot's game after,
+                      0 for no limit
+    returns --  (none)
+    """
+    # Time (in seconds) simulated by each logic tick
+    tick_time = 1 / game.tick_rate
+    # Time that has passed that the logic hasn't simulated yet
+    lag = 0
+    # Count the frames shown
+    frame = 0
+    
+    # ------ Main Program Loop ------
+    while game.is_running():
+        if timer:
+            timer.start_frame()
+        # Process events (e.g. keystrokes, mouseclicks)
+        game.process_events()
+        if timer:
+            timer.mark("process_events")
+        # Run game logic (e.g. object positions, player attributes)
+        # once for every tick that fits in the time that has passed
+        while lag >= tick_time:
+            # Let the bot (if any) press keys before each tick
+            if bot:
+                bot.act()
+            game.run_logic()
+            lag -= tick_time
+        if timer:
+            timer.mark("run_logic")
+        # Draw the current frame (e.g. the graphics),
+        # interpolated by how far we are into the next tick
+        game.display_frame(lag / tick_time)
+        if timer:
+            timer.mark("display_frame")
+        # Pause until next frame
+        elapsed = game.update_clock()
+        if timer:
+            timer.mark("update_clock")
+        # Add the time that passed, and advance transitions (e.g. fades) by it
+        lag += elapsed
+        game.update_transitions(elapsed)
+        if timer:
+            timer.mark("update_transitions")
+        # Stop after the number of frames we were given,
+        # or once the bot's game is over (and shown),
+        # or it has played as long as it may (it may never lose)
+        frame += 1
+        if frames and frame >= frames:
+            game.stop()
+        if bot and game.game_over and not game.transitions.is_active():
+            game.stop()
+        if bot and bot_ticks and game.ticks >= bot_ticks:
+            game.stop()
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
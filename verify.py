@@ -0,0 +1,136 @@
+# Import modules
+import os
+# (keep pygame quiet in every worker process)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Import classes
+from classes.game import Game
+from classes.levels import Level
+from classes.replay import Replay, EXTENSION
+
+def verify_file (filename, snake_model=False):
+    """ Re-simulates a recorded game headless, as fast as possible, and checks
+    that it ends with the score it claims.
+    filename --     (str) The replay file
+    snake_model --  (str) (optional) How to keep the snake, see Game
+    returns --      (dict) The result: file, snake model, ok, claimed and
+                           simulated score, ticks simulated, seconds taken,
+                           and an error (or None)
+    """
+    result = {
+        "file": filename,
+        "model": snake_model,
+        "ok": False,
+        "claimed": None,
+        "score": None,
+        "ticks": 0,
+        "seconds": 0,
+        "error": None
+    }
+    start = time.perf_counter()
+    try:
+        replay = Replay.load(filename)
+    except (OSError, ValueError) as e:
+        result["error"] = str(e)
+        return result
+    result["claimed"] = replay.score
+    # A replay that didn't end can't claim a score
+    if replay.end_tick is None:
+        result["error"] = "replay has no end"
+        return result
+    # Play back the replay, until it ends or goes past its recorded end
+    game = Game("Snake", headless=True, snake_model=snake_model)
+    result["model"] = game.snake_model
+    game.play(replay)
+    while not game.game_over and game.ticks <= replay.end_tick:
+        game.run_logic()
+    result["seconds"] = time.perf_counter() - start
+    result["ticks"] = game.ticks
+    result["score"] = game.score
+    # (ticks are counted after the tick the game ended on)
+    if not game.game_over or game.ticks - 1 != replay.end_tick:
+        result["error"] = "game didn't end on tick {0}".format(replay.end_tick)
+    elif game.score != replay.score:
+        result["error"] = "score doesn't match"
+    else:
+        result["ok"] = True
+    return result
+
+def find_replays (paths):
+    """ Gets the replay files in a list of files and directories.
+    paths --    (list) Replay files, or directories of replay files
+    returns --  (list) The replay files, directories are searched (not deeply)
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(EXTENSION):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+def main ():
+    # Parse command line options
+    parser = argparse.ArgumentParser(
+        description="Verify the scores of recorded Snake games."
+    )
+    parser.add_argument(
+        "paths", nargs="+", metavar="PATH",
+        help="replay files, or directories of {0} files".format(EXTENSION)
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="number of processes to use (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--all-models", action="store_true",
+        help="play back each replay with every snake model ({0}), checking"
+        " each ends on the same tick with the same score".format(
+            ", ".join(Level.PLAYERS)
+        )
+    )
+    args = parser.parse_args()
+    # paths are relative to where we were run, not to the game
+    files = [os.path.abspath(f) for f in find_replays(args.paths)]
+    # play back each file with the default snake model, or with each model
+    models = list(Level.PLAYERS) if args.all_models else [False]
+    runs = [[f, m] for f in files for m in models]
+    
+    start = time.perf_counter()
+    failed = 0
+    ticks = 0
+    # Verify replays in parallel, print each result in order
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for result in pool.map(
+            verify_file, [run[0] for run in runs], [run[1] for run in runs]
+        ):
+            ticks += result["ticks"]
+            # name the snake model when checking every model
+            name = result["file"]
+            if args.all_models:
+                name += " [{0}]".format(result["model"])
+            if result["ok"]:
+                print("OK    {0}: score {1}, {2} ticks ({3:.0f} ticks/s)".format(
+                    name, result["score"], result["ticks"],
+                    result["ticks"] / max(result["seconds"], 1e-9)
+                ))
+            else:
+                failed += 1
+                print("FAIL  {0}: {1} (claimed {2}, simulated {3})".format(
+                    name, result["error"],
+                    result["claimed"], result["score"]
+                ))
+    elapsed = time.perf_counter() - start
+    # Report throughput
+    print("{0} replays, {1} failed, {2} ticks in {3:.2f}s ({4:.0f} ticks/s)".format(
+        len(runs), failed, ticks, elapsed, ticks / max(elapsed, 1e-9)
+    ))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())